@@ -0,0 +1,94 @@
+"""Contrôle du temps d'import des bibliothèques `libs`
+
+Chaque cas est importé dans un interpréteur neuf avec `python -X importtime`.
+Le script échoue (code de sortie 1) si un import dépasse son budget ou charge
+une dépendance lourde qui ne devrait l'être qu'à l'usage (plotly, scipy, ...).
+
+Exemple (depuis le dossier `python`) :
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 5 --scale 2
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (instruction d'import, modules interdits, budget en secondes)
+CASES = [
+    ("import libs.utils", ("pandas", "numpy", "plotly", "scipy", "joblib"), 0.05),
+    ("from libs.utils import bool_to_text", ("pandas", "numpy", "plotly", "scipy", "joblib"), 0.05),
+    ("from libs.utils import get_files", ("pandas", "numpy", "plotly", "scipy", "joblib"), 0.05),
+    ("from libs.utils import get_association_table", ("plotly", "scipy", "joblib"), 1.0),
+    ("import libs.analyzer", ("pandas", "numpy", "plotly", "scipy", "joblib"), 0.05),
+    ("from libs.analyzer import load_profile", ("plotly", "scipy", "joblib"), 1.0),
+    ("from libs.analyzer import analyze_dataframe", ("plotly", "scipy", "joblib"), 1.0),
+]
+
+
+def measure_import(str_statement: str) -> tuple[float, set[str]]:
+    """Importe dans un nouvel interpréteur et lit la sortie de `-X importtime`
+
+    :param str str_statement: Instruction d'import à mesurer
+    :return tuple[float, set[str]]: Temps cumulé des imports de premier niveau
+        (secondes) et ensemble des modules importés
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", str_statement],
+        cwd=PYTHON_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de `{str_statement}` :\n{result.stderr}")
+
+    int_total_us = 0
+    set_modules = set()
+    for str_line in result.stderr.splitlines():
+        if not str_line.startswith("import time:") or "|" not in str_line:
+            continue
+        _, str_cumulative, str_name = str_line[len("import time:"):].split("|", 2)
+        if not str_cumulative.strip().isdigit():
+            continue # En-tête
+        set_modules.add(str_name.strip())
+        if not str_name.startswith("  "): # Import de premier niveau (non imbriqué)
+            int_total_us += int(str_cumulative)
+
+    return int_total_us / 1e6, set_modules
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée du script
+
+    :param list[str] | None argv: Arguments (par défaut ceux de la ligne de commande)
+    :return int: 0 si tous les cas respectent leur budget, 1 sinon
+    """
+    parser = argparse.ArgumentParser(description="Contrôle du temps d'import des bibliothèques libs")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de mesures par cas (le minimum est retenu)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplicateur des budgets (machines lentes)")
+    args = parser.parse_args(argv)
+
+    bool_ok = True
+    for str_statement, tpl_forbidden, flt_budget in CASES:
+        arr_measures = [measure_import(str_statement) for _ in range(max(1, args.repeat))]
+        flt_time = min(flt for flt, _ in arr_measures)
+        set_modules = arr_measures[0][1]
+        arr_loaded = [str_mod for str_mod in tpl_forbidden if str_mod in set_modules]
+        flt_budget *= args.scale
+
+        arr_errors = []
+        if flt_time > flt_budget:
+            arr_errors.append(f"budget dépassé ({flt_budget:.3f}s)")
+        if arr_loaded:
+            arr_errors.append(f"modules chargés : {', '.join(arr_loaded)}")
+        bool_ok &= not arr_errors
+
+        print(f"{'ÉCHEC' if arr_errors else 'OK':5} {flt_time:7.3f}s  {str_statement}  {' ; '.join(arr_errors)}")
+
+    return 0 if bool_ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
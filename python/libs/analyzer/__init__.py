@@ -1 +1,31 @@
-from .analyze import analyze_dataframe
\ No newline at end of file
+"""Analyse de dataframes. Les sous-modules (et plotly) ne sont importés qu'au
+premier accès à l'un de leurs noms"""
+import importlib
+
+_SUBMODULES = ("analyze", "batch", "commons", "drift", "part_datetime", "part_default", "part_numeral", "part_string", "profile")
+
+_EXPORTS = {
+    "analyze_dataframe": "analyze",
+    "render_profile": "analyze",
+    "profile_dataframe": "profile",
+    "save_profile": "profile",
+    "load_profile": "profile",
+    "compare_profiles": "drift",
+    "drift_report": "drift",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__ + list(_SUBMODULES))
@@ -0,0 +1,5 @@
+"""Point d'entrée `python -m libs.analyzer` : profilage en lot (cf. `batch.py`)"""
+from .batch import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,55 +1,144 @@
 import os
+import html
+import json
 import pandas as pd
 
-from .commons import get_part
-from .part_string import analyse_string
-from .part_datetime import analyse_datetime
-from .part_numeral import analyse_numeral
-from .part_default import analyse_default
+from .commons import ColumnProfile, DatasetProfile, get_part, get_plot_templates_json
+from .profile import profile_column, profile_dataframe, save_profile
+from .part_string import render_string
+from .part_datetime import render_datetime
+from .part_numeral import render_numeral
+from .part_default import render_default
 
-def analyze_dataframe(df: pd.DataFrame, output_dir: str = "analyzer", output_name: str = "index"):
-    """Génère une page HTML avec quelques analyses rudimentaires sur un dataframe
+def render_column(dct_profile: ColumnProfile) -> str:
+    """Génère le code HTML d'analyse d'une colonne à partir de son profil, en
+    choisissant la partie correspondant à son dtype
 
-    :param pd.DataFrame df: Dataframe à analyser
-    :param str, optional output_dir: Nom du dossier d'output, defaults to "analyzer"
-    :param str, optional output_name: Nom du fichier d'output, defaults to "index"
+    :param ColumnProfile dct_profile: Profil de la colonne
+    :return str: Code HTML de l'analyse de la colonne
     """
-    str_output = ""
-    arr_cols = df.columns
-    dct_types = df.dtypes
-    for str_col in arr_cols:
-        str_type_name = str(dct_types[str_col]).lower()
-
-        if str_type_name == "string":
-            str_output += analyse_string(df[str_col])
-        elif (
-            str_type_name.startswith("datetime") or
-            str_type_name.startswith("timestamp")
-        ):
-            str_output += analyse_datetime(df[str_col], str(dct_types[str_col]))
-        elif (
-            str_type_name.startswith("int") or
-            str_type_name.startswith("float")
-        ):
-            str_output += analyse_numeral(df[str_col], str(dct_types[str_col]))
-        else:
-            str_output += analyse_default(df[str_col], str(dct_types[str_col]))
+    str_kind = dct_profile["kind"]
 
-        str_output += "<hr>"
-    
+    if str_kind == "string":
+        return render_string(dct_profile)
+    elif str_kind == "datetime":
+        return render_datetime(dct_profile)
+    elif str_kind == "numeral":
+        return render_numeral(dct_profile)
+    else:
+        return render_default(dct_profile)
+
+
+def analyse_column(ser: pd.Series) -> str:
+    """Génère le code HTML d'analyse d'une colonne en choisissant la partie
+    correspondant à son dtype
+
+    :param pd.Series ser: Serie à analyser
+    :return str: Code HTML de l'analyse de la colonne
+    """
+    return render_column(profile_column(ser))
+
+
+def _get_describe(dct_profile: DatasetProfile) -> pd.DataFrame:
+    """Construit la table de description des colonnes d'un profil
 
-    df_desc = pd.concat([
-        pd.DataFrame(df.columns, columns=["Colonnes"]),
-        df.count().reset_index().rename(columns={0: "Nb Non-Null"})["Nb Non-Null"],
-        df.dtypes.reset_index().rename(columns={0: "dtype"})["dtype"]
-    ], axis=1)
-        
+    :param DatasetProfile dct_profile: Profil du dataframe
+    :return pd.DataFrame: Nom, nombre de valeurs non nulles et dtype de chaque colonne
+    """
+    return pd.DataFrame({
+        "Colonnes": [dct_column["name"] for dct_column in dct_profile["columns"]],
+        "Nb Non-Null": [dct_column["count"] for dct_column in dct_profile["columns"]],
+        "dtype": [dct_column["dtype"] for dct_column in dct_profile["columns"]],
+    })
+
+
+def _write_column_file(dct_profile: ColumnProfile, str_path: str) -> None:
+    """Écrit l'analyse d'une colonne dans un fichier JSON (`{"title", "html"}`)
+    chargé à la demande par la page d'index du mode multi-pages
+
+    :param ColumnProfile dct_profile: Profil de la colonne
+    :param str str_path: Chemin du fichier JSON à écrire
+    """
+    with open(str_path, mode="w", encoding="utf-8") as f:
+        json.dump({"title": dct_profile["name"], "html": render_column(dct_profile)}, f, ensure_ascii=False)
+
+
+def render_profile(
+    dct_profile: DatasetProfile,
+    output_dir: str = "analyzer",
+    output_name: str = "index",
+    multi_page: bool = False,
+    max_workers: int = 100
+):
+    """Génère le rapport HTML d'un profil (cf. `profile_dataframe` et
+    `load_profile`), sans accès aux données brutes
+
+    En mode multi-pages (pour les dataframes très larges), la page d'index ne
+    contient que la table de description, qui sert de liste de colonnes
+    triable et filtrable, et l'analyse de chaque colonne est écrite en parallèle
+    dans `<output_name>_columns/<index>.json`, chargé à la demande. Le dossier
+    doit alors être servi par un serveur web (ex: `python -m http.server`)
+
+    :param DatasetProfile dct_profile: Profil du dataframe
+    :param str, optional output_dir: Nom du dossier d'output, defaults to "analyzer"
+    :param str, optional output_name: Nom du fichier d'output, defaults to "index"
+    :param bool, optional multi_page: Écrit une page d'index et un fichier par
+        colonne au lieu d'une page unique, defaults to False
+    :param int, optional max_workers: Nombre de processus utilisés pour écrire
+        les fichiers de colonne en mode multi-pages, defaults to 100
+    """
+    arr_columns = dct_profile["columns"]
+    df_desc = _get_describe(dct_profile)
 
     if os.path.exists(os.path.join(output_dir, f"{output_name}.html")):
         os.remove(os.path.join(output_dir, f"{output_name}.html"))
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    str_plots_script = get_part("plots_script", {"PLOT_TEMPLATES": get_plot_templates_json()})
+
+    if multi_page:
+        str_columns_dir = f"{output_name}_columns"
+        if not os.path.exists(os.path.join(output_dir, str_columns_dir)):
+            os.makedirs(os.path.join(output_dir, str_columns_dir))
+
+        import joblib
+
+        n_jobs = max(1, min(max_workers, joblib.cpu_count(), len(arr_columns)))
+        joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(_write_column_file)(
+                dct_column,
+                os.path.join(output_dir, str_columns_dir, f"{int_col}.json")
+            )
+            for int_col, dct_column in enumerate(arr_columns)
+        )
+
+        df_desc["Colonnes"] = [
+            f'<a href="#col-{int_col}">{html.escape(str_col)}</a>'
+            for int_col, str_col in enumerate(df_desc["Colonnes"])
+        ]
+
+        with open(os.path.join(output_dir, f"{output_name}.html"), mode="w", encoding="utf-8") as f:
+            f.write(
+                get_part(
+                    "multi_index",
+                    {
+                        "TITLE": output_name,
+                        "DESCRIBE": df_desc.to_html(index=False, border=0, justify="inherit", escape=False, classes="table table-sm table-hover"),
+                        "ROW_COUNT": dct_profile["row_count"],
+                        "COL_COUNT": dct_profile["col_count"],
+                        "COLUMNS_DIR": str_columns_dir,
+                        "PLOTS_SCRIPT": str_plots_script
+                    }
+                )
+            )
+        return
+
+    str_output = ""
+    for dct_column in arr_columns:
+        str_output += render_column(dct_column)
+        str_output += "<hr>"
+
     with open(os.path.join(output_dir, f"{output_name}.html"), mode="w", encoding="utf-8") as f:
         f.write(
             get_part(
@@ -57,9 +146,40 @@ def analyze_dataframe(df: pd.DataFrame, output_dir: str = "analyzer", output_nam
                 {
                     "TITLE": output_name,
                     "DESCRIBE": df_desc.to_html(index=False, border=0, justify="inherit", classes="table table-sm table-hover"),
-                    "ROW_COUNT": df.shape[0],
-                    "COL_COUNT": df.shape[1],
-                    "CONTENT": str_output
+                    "ROW_COUNT": dct_profile["row_count"],
+                    "COL_COUNT": dct_profile["col_count"],
+                    "CONTENT": str_output,
+                    "PLOTS_SCRIPT": str_plots_script
                 }
             )
         )
+
+
+def analyze_dataframe(
+    df: pd.DataFrame,
+    output_dir: str = "analyzer",
+    output_name: str = "index",
+    multi_page: bool = False,
+    max_workers: int = 100,
+    profile_path: str | None = None
+):
+    """Génère une page HTML avec quelques analyses rudimentaires sur un dataframe.
+    Le profil du dataframe est d'abord calculé (`profile_dataframe`), puis rendu
+    (`render_profile`)
+
+    :param pd.DataFrame df: Dataframe à analyser
+    :param str, optional output_dir: Nom du dossier d'output, defaults to "analyzer"
+    :param str, optional output_name: Nom du fichier d'output, defaults to "index"
+    :param bool, optional multi_page: Écrit une page d'index et un fichier par
+        colonne au lieu d'une page unique (cf. `render_profile`), defaults to False
+    :param int, optional max_workers: Nombre de processus utilisés en mode
+        multi-pages pour profiler les colonnes et écrire leurs fichiers, defaults to 100
+    :param str | None, optional profile_path: Si renseigné, le profil est aussi
+        sauvegardé dans ce fichier (`.json` ou `.parquet`), defaults to None
+    """
+    dct_profile = profile_dataframe(df, name=output_name, max_workers=max_workers if multi_page else 1)
+
+    if profile_path is not None:
+        save_profile(dct_profile, profile_path)
+
+    render_profile(dct_profile, output_dir, output_name, multi_page=multi_page, max_workers=max_workers)
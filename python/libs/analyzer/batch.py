@@ -0,0 +1,377 @@
+"""Profilage en lot de fichiers de données depuis la ligne de commande
+
+Exemple (depuis le dossier `python`) :
+
+    python -m libs.analyzer "landing/*.parquet" "exports/*.csv" -o rapports -w 4 -m 8000 --sample 1000000 --association
+
+Le point d'entrée `python -m libs.analyzer` (cf. `__main__.py`) appelle `main`.
+Chaque fichier est profilé dans son propre processus (`analyze_dataframe`), les
+rapports sont écrits à plat dans le dossier d'output (`<nom>.html`) afin de
+partager les dossiers `css` et `js`, et un index récapitulatif (`index.html`)
+est écrit à la fin. Avec `--profile`, le profil de chaque fichier est aussi
+sauvegardé : il peut ensuite être re-rendu ailleurs en passant les fichiers
+`*.profile.json` / `*.profile.parquet` comme globs.
+"""
+import os
+import time
+import argparse
+import html
+import multiprocessing
+from multiprocessing.connection import wait
+from urllib.parse import quote
+import pandas as pd
+
+from ..utils.file_system import get_files
+from .commons import get_part
+
+READERS = {
+    ".csv": pd.read_csv,
+    ".parquet": pd.read_parquet,
+    ".pq": pd.read_parquet,
+    ".feather": pd.read_feather,
+    ".json": pd.read_json,
+    ".jsonl": lambda str_path, **kwargs: pd.read_json(str_path, lines=True, **kwargs),
+    ".xlsx": pd.read_excel,
+    ".pkl": pd.read_pickle,
+    ".pickle": pd.read_pickle,
+}
+PROFILE_SUFFIXES = (".profile.json", ".profile.parquet") # Profils déjà calculés (cf. `save_profile`), rendus sans relire les données
+
+
+def _read_dataset(str_path: str, arrow: bool = False) -> pd.DataFrame:
+    """Lit un fichier de données selon son extension
+
+    :param str str_path: Chemin du fichier
+    :param bool arrow: Charge les colonnes avec des dtypes Arrow (`dtype_backend="pyarrow"`)
+    :return pd.DataFrame: Le dataframe lu
+    """
+    str_ext = os.path.splitext(str_path)[1].lower()
+    if str_ext not in READERS:
+        raise ValueError(f"Extension '{str_ext}' non supportée ({', '.join(READERS)})")
+
+    if str_ext in (".pkl", ".pickle") or not arrow:
+        return READERS[str_ext](str_path)
+    return READERS[str_ext](str_path, dtype_backend="pyarrow")
+
+
+def _limit_memory(int_memory_mb: int | None) -> None:
+    """Limite l'espace d'adressage du processus courant (Unix uniquement).
+    Un job dépassant la limite échoue sans impacter les autres : le plus souvent
+    avec une `MemoryError`, mais une allocation refusée dans pyarrow ou BLAS
+    remonte parfois comme une erreur sans rapport (ex: `ParserError ... Calling
+    read(nbytes) on source failed`), d'où la mention de la limite dans le statut
+    (cf. `_add_memory_limit`). La limite porte sur la mémoire virtuelle, qui
+    inclut les zones réservées (et non utilisées) par pyarrow et BLAS
+
+    :param int | None int_memory_mb: Limite en Mo, `None` pour ne pas limiter
+    """
+    if int_memory_mb is None:
+        return
+    try:
+        import resource
+    except ImportError:
+        print("WARNING - Limite mémoire non supportée sur cette plateforme, ignorée")
+        return
+    int_bytes = int_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (int_bytes, int_bytes))
+
+
+def _profile_dataset(str_path: str, str_name: str, dct_options: dict) -> dict:
+    """Profile un fichier : lecture, échantillonnage éventuel, rapport HTML et
+    table d'association. Un profil déjà calculé (`*.profile.json` ou
+    `*.profile.parquet`) est uniquement rendu. Exécuté dans un processus dédié
+
+    :param str str_path: Chemin du fichier à profiler
+    :param str str_name: Nom du rapport (sans extension)
+    :param dict dct_options: Options de la ligne de commande
+    :return dict: Ligne de l'index récapitulatif
+    """
+    from .analyze import analyze_dataframe, render_profile
+    from .profile import load_profile
+
+    dct_result = {
+        "Fichier": str_path,
+        "Rapport": str_name,
+        "Lignes": None,
+        "Colonnes": None,
+        "Durée (s)": None,
+        "Statut": "OK",
+    }
+    t0 = time.perf_counter()
+    try:
+        if str_path.lower().endswith(PROFILE_SUFFIXES):
+            dct_profile = load_profile(str_path)
+            dct_result["Lignes"] = dct_profile["row_count"]
+            dct_result["Colonnes"] = dct_profile["col_count"]
+            render_profile(
+                dct_profile,
+                output_dir=dct_options["output_dir"],
+                output_name=str_name,
+                multi_page=dct_options["multi_page"],
+                max_workers=1
+            )
+            dct_result["Statut"] = "OK (rendu du profil)"
+            dct_result["Durée (s)"] = round(time.perf_counter() - t0, 2)
+            return dct_result
+
+        df = _read_dataset(str_path, dct_options["arrow"])
+        dct_result["Lignes"] = df.shape[0]
+        dct_result["Colonnes"] = df.shape[1]
+
+        if dct_options["sample"] is not None and df.shape[0] > dct_options["sample"]:
+            df = df.sample(n=dct_options["sample"], random_state=dct_options["seed"])
+            dct_result["Statut"] = f"OK (échantillon de {dct_options['sample']} lignes)"
+
+        analyze_dataframe(
+            df,
+            output_dir=dct_options["output_dir"],
+            output_name=str_name,
+            multi_page=dct_options["multi_page"],
+            max_workers=1,
+            profile_path=(
+                os.path.join(dct_options["output_dir"], f"{str_name}.profile.{dct_options['profile']}")
+                if dct_options["profile"] is not None else None
+            )
+        )
+
+        if dct_options["association"]:
+            from ..utils.analysis import get_association_table, draw_correlation_heatmap
+
+            df_association = get_association_table(df, max_workers=1)
+            df_association.to_csv(os.path.join(dct_options["output_dir"], f"{str_name}_association.csv"))
+            draw_correlation_heatmap(
+                df_association,
+                title=f"Association - {str_name}",
+                output_path=os.path.join(dct_options["output_dir"], f"{str_name}_association.html"),
+                show=False
+            )
+    except MemoryError:
+        dct_result["Statut"] = "ERREUR - Limite mémoire dépassée"
+    except Exception as e:
+        dct_result["Statut"] = f"ERREUR - {type(e).__name__}: {e}"
+
+    dct_result["Durée (s)"] = round(time.perf_counter() - t0, 2)
+    return dct_result
+
+
+def _run_job(conn, str_path: str, str_name: str, dct_options: dict, int_memory_mb: int | None) -> None:
+    """Point d'entrée du processus dédié à un fichier : applique la limite
+    mémoire, profile le fichier et renvoie la ligne d'index par `conn`
+
+    :param Connection conn: Extrémité du pipe vers le processus principal
+    :param str str_path: Chemin du fichier à profiler
+    :param str str_name: Nom du rapport (sans extension)
+    :param dict dct_options: Options de la ligne de commande
+    :param int | None int_memory_mb: Limite mémoire en Mo (cf. `_limit_memory`)
+    """
+    _limit_memory(int_memory_mb)
+    conn.send(_profile_dataset(str_path, str_name, dct_options))
+    conn.close()
+
+
+def _get_killed_result(str_path: str, str_name: str, int_exitcode: int | None) -> dict:
+    """Ligne d'index d'un job dont le processus s'est arrêté sans renvoyer de
+    résultat (OOM killer, segfault, ...)
+
+    :param str str_path: Chemin du fichier
+    :param str str_name: Nom du rapport
+    :param int | None int_exitcode: Code de sortie du processus (négatif : signal)
+    :return dict: Ligne de l'index récapitulatif
+    """
+    if int_exitcode is not None and int_exitcode < 0:
+        str_status = f"ERREUR - Processus tué (signal {-int_exitcode})"
+    else:
+        str_status = f"ERREUR - Processus arrêté sans résultat (code {int_exitcode})"
+    return {"Fichier": str_path, "Rapport": str_name, "Statut": str_status}
+
+
+def _add_memory_limit(dct_result: dict, int_memory_mb: int | None) -> dict:
+    """Renseigne la limite mémoire active dans la ligne d'index d'un job et la
+    mentionne dans le statut d'erreur, l'erreur pouvant en être la conséquence
+    sans le dire (cf. `_limit_memory`)
+
+    :param dict dct_result: Ligne de l'index récapitulatif, modifiée en place
+    :param int | None int_memory_mb: Limite mémoire par job en Mo
+    :return dict: La ligne d'index
+    """
+    if int_memory_mb is None:
+        return dct_result
+    dct_result["Limite mémoire (Mo)"] = int_memory_mb
+    str_status = str(dct_result["Statut"])
+    if str_status.startswith("ERREUR") and "Limite mémoire dépassée" not in str_status:
+        dct_result["Statut"] = f"{str_status} (limite mémoire de {int_memory_mb} Mo active, peut en être la cause)"
+    return dct_result
+
+
+def _run_jobs(arr_jobs: list[tuple[str, str]], dct_options: dict, int_workers: int, int_memory_mb: int | None) -> list[dict]:
+    """Exécute chaque job dans son propre processus (au plus `int_workers` à la
+    fois). Un processus neuf par fichier rend la mémoire au système entre deux
+    fichiers, et un processus tué n'impacte que son propre fichier
+
+    :param list[tuple[str, str]] arr_jobs: Couples (chemin du fichier, nom du rapport)
+    :param dict dct_options: Options de la ligne de commande
+    :param int int_workers: Nombre maximal de processus simultanés
+    :param int | None int_memory_mb: Limite mémoire par job en Mo
+    :return list[dict]: Lignes de l'index récapitulatif, dans l'ordre de fin des jobs
+    """
+    ctx = multiprocessing.get_context("spawn")
+    arr_pending = list(reversed(arr_jobs))
+    dct_running = {} # sentinelle -> (processus, pipe, chemin, nom)
+    arr_results = []
+
+    while arr_pending or dct_running:
+        while arr_pending and len(dct_running) < max(1, int_workers):
+            str_file, str_name = arr_pending.pop()
+            conn_parent, conn_child = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_run_job, args=(conn_child, str_file, str_name, dct_options, int_memory_mb))
+            process.start()
+            conn_child.close()
+            dct_running[process.sentinel] = (process, conn_parent, str_file, str_name)
+
+        for sentinel in wait(list(dct_running)):
+            process, conn_parent, str_file, str_name = dct_running.pop(sentinel)
+            process.join()
+            dct_result = None
+            try:
+                if conn_parent.poll():
+                    dct_result = conn_parent.recv()
+            except (EOFError, OSError):
+                pass
+            conn_parent.close()
+            if dct_result is None:
+                dct_result = _get_killed_result(str_file, str_name, process.exitcode)
+            _add_memory_limit(dct_result, int_memory_mb)
+            print(f"INFO - {str_file}: {dct_result['Statut']}")
+            arr_results.append(dct_result)
+
+    return arr_results
+
+
+def _get_report_names(arr_files: list[str]) -> list[str]:
+    """Génère un nom de rapport unique par fichier à partir de son nom sans extension
+
+    :param list[str] arr_files: Liste des fichiers
+    :return list[str]: Noms de rapport, dans le même ordre
+    """
+    arr_names = []
+    set_used = {"index"}
+    for str_file in arr_files:
+        str_base = os.path.splitext(os.path.basename(str_file))[0]
+        if str_file.lower().endswith(PROFILE_SUFFIXES):
+            str_base = os.path.splitext(str_base)[0]
+        str_name = str_base
+        int_suffix = 1
+        while str_name in set_used:
+            int_suffix += 1
+            str_name = f"{str_base}_{int_suffix}"
+        set_used.add(str_name)
+        arr_names.append(str_name)
+    return arr_names
+
+
+def _get_href(str_name: str) -> str:
+    """Encode un nom de rapport pour un attribut `href` (URL puis HTML)
+
+    :param str str_name: Nom du rapport
+    :return str: Le nom encodé
+    """
+    return html.escape(quote(str_name))
+
+
+def _write_summary(arr_results: list[dict], str_output_dir: str, bool_association: bool) -> None:
+    """Écrit l'index récapitulatif des rapports générés
+
+    :param list[dict] arr_results: Résultats des jobs
+    :param str str_output_dir: Dossier d'output
+    :param bool bool_association: Ajoute les liens vers les tables d'association
+    """
+    arr_columns = ["Fichier", "Rapport", "Lignes", "Colonnes", "Durée (s)", "Statut"]
+    if any("Limite mémoire (Mo)" in dct_result for dct_result in arr_results):
+        arr_columns.insert(-1, "Limite mémoire (Mo)")
+    df_summary = pd.DataFrame(arr_results, columns=arr_columns)
+    df_summary = df_summary.sort_values("Fichier", ignore_index=True)
+    df_summary = df_summary.astype({str_col: "Int64" for str_col in ("Lignes", "Colonnes", "Limite mémoire (Mo)") if str_col in arr_columns})
+    df_summary.to_csv(os.path.join(str_output_dir, "index.csv"), index=False)
+
+    bool_ok = df_summary["Statut"].str.startswith("OK")
+    if bool_association:
+        df_summary["Association"] = [
+            f'<a href="{_get_href(str_name)}_association.html">heatmap</a> / <a href="{_get_href(str_name)}_association.csv">csv</a>' if ok else ""
+            for str_name, ok in zip(df_summary["Rapport"], bool_ok)
+        ]
+    df_summary["Rapport"] = [
+        f'<a href="{_get_href(str_name)}.html">{html.escape(str_name)}</a>' if ok else html.escape(str_name)
+        for str_name, ok in zip(df_summary["Rapport"], bool_ok)
+    ]
+    df_summary["Fichier"] = [html.escape(str(str_file)) for str_file in df_summary["Fichier"]]
+    df_summary["Statut"] = [html.escape(str(str_status)) for str_status in df_summary["Statut"]]
+
+    with open(os.path.join(str_output_dir, "index.html"), mode="w", encoding="utf-8") as f:
+        f.write(
+            get_part(
+                "summary",
+                {
+                    "FILE_COUNT": df_summary.shape[0],
+                    "ERROR_COUNT": int((~bool_ok).sum()),
+                    "SUMMARY": df_summary.to_html(index=False, border=0, justify="inherit", escape=False, classes="table table-sm table-hover"),
+                }
+            )
+        )
+
+
+def main(arr_args: list[str] | None = None) -> int:
+    """Point d'entrée de `python -m libs.analyzer`
+
+    :param list[str] | None arr_args: Arguments de la ligne de commande, defaults to `sys.argv`
+    :return int: Code de retour (1 si au moins un fichier est en erreur)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m libs.analyzer",
+        description="Profile en lot des fichiers de données et génère un rapport HTML par fichier"
+    )
+    parser.add_argument("patterns", nargs="+", help="Globs des fichiers à profiler (csv, parquet, feather, json, jsonl, xlsx, pkl) ou des profils à rendre (*.profile.json, *.profile.parquet)")
+    parser.add_argument("-o", "--output-dir", default="analyzer", help="Dossier d'output (défaut: analyzer)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Nombre de processus en parallèle (défaut: nombre de CPU)")
+    parser.add_argument("-m", "--memory-limit", type=int, default=None, help=(
+        "Limite mémoire par job en Mo (Unix uniquement). Limite l'espace d'adressage (RLIMIT_AS) : "
+        "la mémoire virtuelle réservée par pyarrow et BLAS compte aussi, une limite trop basse fait échouer "
+        "les jobs dès la lecture, parfois avec une erreur sans rapport apparent"
+    ))
+    parser.add_argument("--sample", type=int, default=None, help="Nombre maximal de lignes profilées par fichier (échantillon aléatoire)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de l'échantillonnage (défaut: 0)")
+    parser.add_argument("--association", action="store_true", help="Calcule la table d'association (get_association_table) de chaque fichier")
+    parser.add_argument("--multi-page", action="store_true", help="Génère des rapports multi-pages (tables très larges)")
+    parser.add_argument("--arrow", action="store_true", help="Charge les fichiers avec des dtypes Arrow")
+    parser.add_argument("--profile", choices=["json", "parquet"], default=None, help="Sauvegarde aussi le profil de chaque fichier (<nom>.profile.<format>)")
+    args = parser.parse_args(arr_args)
+
+    arr_files = sorted({str_file for str_glob in args.patterns for str_file in get_files(str_glob) if os.path.isfile(str_file)})
+    if len(arr_files) == 0:
+        print("ERROR - Aucun fichier ne correspond aux globs donnés")
+        return 1
+
+    if not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    dct_options = {
+        "output_dir": args.output_dir,
+        "sample": args.sample,
+        "seed": args.seed,
+        "association": args.association,
+        "multi_page": args.multi_page,
+        "arrow": args.arrow,
+        "profile": args.profile,
+    }
+    print(f"INFO - {len(arr_files)} fichier(s) à profiler (workers={args.workers})")
+
+    arr_results = _run_jobs(
+        list(zip(arr_files, _get_report_names(arr_files))),
+        dct_options,
+        args.workers,
+        args.memory_limit
+    )
+
+    _write_summary(arr_results, args.output_dir, args.association)
+    print(f"INFO - Index écrit dans {os.path.join(args.output_dir, 'index.html')}")
+
+    return int(any(not str(r["Statut"]).startswith("OK") for r in arr_results))
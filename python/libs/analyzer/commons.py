@@ -1,9 +1,22 @@
-from typing import TypedDict
-from plotly.graph_objects import Figure
+from typing import TypedDict, TYPE_CHECKING
+from datetime import date, datetime
 import os
-import plotly.graph_objects as go
+import json
+import uuid
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from plotly.graph_objects import Figure
+
+PLOT_TEMPLATES = ("plotly", "plotly_white") # Templates partagés par tous les graphiques du rapport
+PLOT_DEFAULT_HEIGHT = 450 # Hauteur par défaut d'un graphique Plotly (px)
+PLOT_DEFAULT_WIDTH = 700 # Largeur par défaut d'un graphique Plotly (px)
+PROFILE_VERSION = 2 # Version du format des profils sérialisés
+PROFILE_QUANTILES = 101 # Nombre de quantiles (0%, 1%, ..., 100%) conservés dans un profil
+PROFILE_MAX_VALUES = 1000 # Nombre de valeurs les plus fréquentes conservées dans un profil
+
 class ColumnInformations(TypedDict):
     """Objet retourné par les fonctions d'analyse de colonne
 
@@ -12,7 +25,7 @@ class ColumnInformations(TypedDict):
       fichier image, et en valeur le plot correspondant à l'image
     """
     html: str
-    plots: dict[str, Figure]
+    plots: dict[str, "Figure"]
 
 def get_part(part_name: str, parameters: dict = {}) -> str:
     """Récupère le code HTML
@@ -33,6 +46,413 @@ def get_part(part_name: str, parameters: dict = {}) -> str:
     return str_part_code
 
 
+def get_graph_html(fig: "Figure") -> str:
+    """Transforme une figure Plotly en un emplacement HTML rendu à la demande.
+    La spécification de la figure est stockée dans un bloc JSON compact (les
+    tableaux NumPy sont encodés en base64 typé par Plotly) sans son template,
+    qui est partagé au niveau de la page (cf. `get_plot_templates_json`) et
+    retiré de la figure passée. Le graphique n'est dessiné que lorsqu'il entre
+    dans la zone visible
+
+    :param Figure fig: Figure à insérer dans le rapport
+    :return str: Code HTML de l'emplacement et de la spécification JSON
+    """
+    import plotly.io as pio
+
+    str_template = ""
+    for str_name in PLOT_TEMPLATES:
+        if fig.layout.template == pio.templates[str_name]:
+            str_template = str_name
+            break
+    if str_template:
+        fig.update_layout(template=None)
+
+    str_plot_id = f"plot-{uuid.uuid4().hex}"
+    int_height = fig.layout.height or PLOT_DEFAULT_HEIGHT
+    int_width = fig.layout.width or PLOT_DEFAULT_WIDTH
+
+    return (
+        f'<div><div id="{str_plot_id}" class="plotly-graph-div lazy-plot" data-template="{str_template}" '
+        f'style="height:{int_height}px; width:{int_width}px;"></div>'
+        f'<script type="application/json" id="{str_plot_id}-spec">{fig.to_json()}</script></div>'
+    )
+
+
+def get_plot_templates_json() -> str:
+    """Sérialise les templates Plotly partagés par les graphiques du rapport
+
+    :return str: JSON avec en clé le nom du template et en valeur sa définition
+    """
+    import plotly.io as pio
+
+    return json.dumps(
+        {str_name: pio.templates[str_name].to_plotly_json() for str_name in PLOT_TEMPLATES}
+    ).replace("</", "<\\/")
+
+
+###############################################################################
+#                                                                             #
+#                   DTYPE DISPATCH & STATISTIQUES                             #
+#                                                                             #
+###############################################################################
+
+
+def get_column_kind(dtype) -> str:
+    """Détermine la partie d'analyse à utiliser pour un dtype donné. Les dtypes
+    NumPy, les extensions pandas (nullable, categorical) et les dtypes Arrow
+    (`int64[pyarrow]`, `string[pyarrow]`, `timestamp[ns][pyarrow]`, ...) sont
+    reconnus à partir de leur `kind` plutôt que de leur nom. Les décimaux Arrow
+    (`decimal128/256[pyarrow]`, de kind `"O"`) sont traités comme `"numeral"`
+
+    :param dtype: dtype de la colonne à analyser
+    :return str: `"string"`, `"datetime"`, `"numeral"` ou `"default"`
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "default"
+    if isinstance(dtype, pd.StringDtype):
+        return "string"
+    if isinstance(dtype, pd.ArrowDtype) and dtype.kind == "U":
+        return "string"
+    if _is_arrow_decimal(dtype):
+        return "numeral"
+
+    str_kind = getattr(dtype, "kind", "O")
+    if str_kind == "M":
+        return "datetime"
+    if str_kind in ("i", "u", "f"):
+        return "numeral"
+    return "default"
+
+
+def _is_arrow_decimal(dtype) -> bool:
+    """Indique si un dtype est un décimal Arrow (`decimal128`/`decimal256`)
+
+    :param dtype: dtype à tester
+    :return bool: `True` pour un décimal Arrow
+    """
+    if not isinstance(dtype, pd.ArrowDtype):
+        return False
+    import pyarrow as pa
+
+    return pa.types.is_decimal(dtype.pyarrow_dtype)
+
+
+def _is_arrow_numeral(ser: pd.Series) -> bool:
+    """Indique si une série est Arrow-backed avec un type numérique (entier,
+    flottant ou décimal)
+
+    :param pd.Series ser: Série à tester
+    :return bool: `True` si les kernels `pyarrow.compute` peuvent être utilisés
+    """
+    return isinstance(ser.dtype, pd.ArrowDtype) and (ser.dtype.kind in ("i", "u", "f") or _is_arrow_decimal(ser.dtype))
+
+
+def _get_arrow_numeral(ser: pd.Series):
+    """Tableau Arrow d'une série numérique Arrow-backed. Les décimaux sont
+    convertis en float64, que `pyarrow.compute.quantile` accepte
+
+    :param pd.Series ser: Série numérique Arrow-backed
+    :return pa.Array: Le tableau Arrow
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arr = pa.array(ser.array)
+    if pa.types.is_decimal(arr.type):
+        arr = pc.cast(arr, pa.float64())
+    return arr
+
+
+def get_value_counts(ser: pd.Series) -> pd.DataFrame:
+    """Compte les occurrences de chaque valeur non nulle d'une série, triées
+    par nombre décroissant. Les séries Arrow-backed sont comptées avec
+    `pyarrow.compute.value_counts` et les catégorielles à partir de leurs codes,
+    sans passer par un objet Python par ligne
+
+    :param pd.Series ser: Série à analyser
+    :return pd.DataFrame: DataFrame avec la colonne de la série (valeurs) et la
+        colonne `"Nb"` (nombre d'occurrences)
+    """
+    str_col_name = ser.name
+
+    if isinstance(ser.dtype, pd.ArrowDtype):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arr_counts = pc.value_counts(pc.drop_null(pa.array(ser.array)))
+        df_counts = pd.DataFrame({
+            str_col_name: pd.Series(arr_counts.field("values"), dtype=ser.dtype),
+            "Nb": arr_counts.field("counts").to_numpy(),
+        })
+    elif isinstance(ser.dtype, pd.CategoricalDtype):
+        arr_codes = ser.cat.codes.to_numpy()
+        arr_nb = np.bincount(arr_codes[arr_codes != -1], minlength=len(ser.cat.categories))
+        arr_observed = np.flatnonzero(arr_nb)
+        df_counts = pd.DataFrame({
+            str_col_name: pd.Categorical.from_codes(arr_observed, dtype=ser.dtype),
+            "Nb": arr_nb[arr_observed],
+        })
+    else:
+        return ser.value_counts().reset_index().rename(columns={"count": "Nb"})
+
+    return df_counts.sort_values("Nb", ascending=False, kind="stable", ignore_index=True)
+
+
+def get_key_figures(ser: pd.Series) -> dict[str, any]:
+    """Calcule les chiffres clés d'une série (moyenne, minimum, quartiles, maximum).
+    Les séries numériques Arrow-backed utilisent `pyarrow.compute` (`mean`,
+    `min_max`, `quantile`) en une passe chacun, sans conversion vers NumPy
+    (les décimaux sont convertis en float64)
+
+    :param pd.Series ser: Série numérique ou datetime à analyser
+    :return dict[str, any]: Dictionnaire avec les clés `mean`, `min`, `qt1`,
+        `qt2`, `qt3` et `max`
+    """
+    if _is_arrow_numeral(ser):
+        import pyarrow.compute as pc
+
+        arr = _get_arrow_numeral(ser)
+        dct_min_max = pc.min_max(arr).as_py()
+        arr_qt = pc.quantile(arr, q=[0.25, 0.50, 0.75]).to_pylist()
+        arr_qt += [None] * (3 - len(arr_qt))
+        lst_values = [pc.mean(arr).as_py(), dct_min_max["min"], *arr_qt, dct_min_max["max"]]
+        return {
+            k: np.nan if v is None else v
+            for k, v in zip(("mean", "min", "qt1", "qt2", "qt3", "max"), lst_values)
+        }
+
+    arr_qt = ser.quantile([0.25, 0.50, 0.75])
+    return {
+        "mean": ser.mean(),
+        "min": ser.min(),
+        "qt1": arr_qt.iloc[0],
+        "qt2": arr_qt.iloc[1],
+        "qt3": arr_qt.iloc[2],
+        "max": ser.max(),
+    }
+
+
+def get_quantiles(ser: pd.Series, int_n: int = PROFILE_QUANTILES) -> list:
+    """Calcule `int_n` quantiles régulièrement espacés (de 0 à 1) d'une série,
+    avec `pyarrow.compute.quantile` pour les séries numériques Arrow-backed
+
+    :param pd.Series ser: Série numérique ou datetime
+    :param int int_n: Nombre de quantiles, defaults to `PROFILE_QUANTILES`
+    :return list: Les quantiles (vides si la série n'a aucune valeur non nulle)
+    """
+    arr_q = np.linspace(0, 1, int_n)
+    if ser.count() == 0:
+        return []
+    if _is_arrow_numeral(ser):
+        import pyarrow.compute as pc
+
+        return pc.quantile(_get_arrow_numeral(ser), q=arr_q).to_pylist()
+    return ser.quantile(arr_q).tolist()
+
+
+###############################################################################
+#                                                                             #
+#                   PROFILS (STATISTIQUES SÉRIALISABLES)                      #
+#                                                                             #
+###############################################################################
+
+
+class ValueCounts(TypedDict):
+    """Valeurs et nombres d'occurrences, dans le même ordre
+
+    :cvar list values: Valeurs (types JSON, les dates sont au format ISO)
+    :cvar list[int] counts: Nombre d'occurrences de chaque valeur
+    """
+    values: list
+    counts: list[int]
+
+
+class Histogram(TypedDict):
+    """Histogramme pré-calculé
+
+    :cvar list[float] edges: Bornes des intervalles (`len(counts) + 1` éléments)
+    :cvar list[int] counts: Nombre de valeurs dans chaque intervalle
+    """
+    edges: list[float]
+    counts: list[int]
+
+
+class ColumnProfile(TypedDict):
+    """Profil d'une colonne : statistiques calculées une fois, sans HTML, et
+    sérialisables en JSON
+
+    :cvar str name: Nom de la colonne
+    :cvar str dtype: dtype exact de la colonne
+    :cvar str kind: Partie d'analyse (cf. `get_column_kind`)
+    :cvar int count: Nombre de valeurs non nulles
+    :cvar int null_count: Nombre de valeurs nulles
+    :cvar int distinct_count: Nombre de valeurs distinctes non nulles
+    :cvar dict | None stats: Chiffres clés (`mean`, `min`, `qt1`, `qt2`, `qt3`,
+        `max`) pour les parties `numeral` et `datetime`
+    :cvar ValueCounts value_counts: Valeurs les plus fréquentes (au plus
+        `PROFILE_MAX_VALUES`), par nombre décroissant
+    :cvar ValueCounts top: 5 valeurs les plus fréquentes
+    :cvar ValueCounts flop: 5 valeurs les moins fréquentes
+    :cvar Histogram | None histogram: Histogramme pour la partie `numeral`
+    :cvar list | None quantiles: Esquisse de la distribution (`PROFILE_QUANTILES`
+        quantiles régulièrement espacés) pour les parties `numeral` et `datetime`
+    """
+    name: str
+    dtype: str
+    kind: str
+    count: int
+    null_count: int
+    distinct_count: int
+    stats: dict[str, float | str | None] | None
+    value_counts: ValueCounts
+    top: ValueCounts
+    flop: ValueCounts
+    histogram: Histogram | None
+    quantiles: list[float | str | None] | None
+
+
+class DatasetProfile(TypedDict):
+    """Profil d'un dataframe
+
+    :cvar int version: Version du format (`PROFILE_VERSION`)
+    :cvar str name: Nom du dataset
+    :cvar int row_count: Nombre de lignes
+    :cvar int col_count: Nombre de colonnes
+    :cvar list[ColumnProfile] columns: Profil de chaque colonne
+    """
+    version: int
+    name: str
+    row_count: int
+    col_count: int
+    columns: list[ColumnProfile]
+
+
+def to_json_value(val: any) -> any:
+    """Convertit une valeur (scalaire NumPy, Timestamp, date, ...) en valeur JSON
+
+    :param any val: Valeur à convertir
+    :return any: `None` pour une valeur nulle ou un flottant non fini (JSON
+        n'a ni NaN ni infini), une date au format ISO, un nombre, un booléen,
+        un string, ou à défaut `str(val)`
+    """
+    if val is None:
+        return None
+    if isinstance(val, (datetime, date, pd.Timestamp)):
+        return None if pd.isna(val) else val.isoformat()
+    if isinstance(val, np.generic):
+        val = val.item()
+    if isinstance(val, float) and not np.isfinite(val):
+        return None
+    if isinstance(val, (bool, int, float, str)):
+        return val
+    try:
+        if pd.isna(val):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(val)
+
+
+def _to_value_counts(df_counts: pd.DataFrame) -> ValueCounts:
+    """Convertit une table de `get_value_counts` en `ValueCounts`
+
+    :param pd.DataFrame df_counts: Table (valeurs, `"Nb"`)
+    :return ValueCounts: Valeurs et nombres d'occurrences
+    """
+    return {
+        "values": [to_json_value(v) for v in df_counts.iloc[:, 0]],
+        "counts": [int(v) for v in df_counts["Nb"]],
+    }
+
+
+def get_base_profile(ser: pd.Series, kind: str) -> ColumnProfile:
+    """Calcule la partie commune du profil d'une colonne (comptages, valeurs
+    les plus et les moins fréquentes). Les champs propres à une partie
+    (`stats`, `histogram`) sont à `None`
+
+    :param pd.Series ser: Série à profiler
+    :param str kind: Partie d'analyse de la colonne
+    :return ColumnProfile: Profil de la colonne
+    """
+    df_counts = get_value_counts(ser)
+    int_count = int(df_counts["Nb"].sum())
+
+    return {
+        "name": str(ser.name),
+        "dtype": str(ser.dtype),
+        "kind": kind,
+        "count": int_count,
+        "null_count": int(ser.shape[0] - int_count),
+        "distinct_count": int(df_counts.shape[0]),
+        "stats": None,
+        "value_counts": _to_value_counts(df_counts[:PROFILE_MAX_VALUES]),
+        "top": _to_value_counts(df_counts.sort_values("Nb", ascending=False, kind="stable")[:5]),
+        "flop": _to_value_counts(df_counts.sort_values("Nb", kind="stable")[:5]),
+        "histogram": None,
+        "quantiles": None,
+    }
+
+
+def get_counts_frame(dct_counts: ValueCounts, str_col_name: str, is_datetime: bool = False) -> pd.DataFrame:
+    """Reconstruit une table (valeurs, `"Nb"`) à partir d'un `ValueCounts`
+
+    :param ValueCounts dct_counts: Valeurs et nombres d'occurrences
+    :param str str_col_name: Nom de la colonne des valeurs
+    :param bool is_datetime: Reconvertit les valeurs ISO en datetime
+    :return pd.DataFrame: Table avec les colonnes `str_col_name` et `"Nb"`
+    """
+    arr_values = dct_counts["values"]
+    if is_datetime:
+        arr_values = pd.to_datetime(pd.Series(arr_values, dtype=object), format="ISO8601")
+    return pd.DataFrame({str_col_name: arr_values, "Nb": dct_counts["counts"]})
+
+
+def get_counts_table_html(dct_counts: ValueCounts, str_col_name: str, is_datetime: bool = False) -> str:
+    """Génère la table HTML d'un `ValueCounts` (top/flop 5)
+
+    :param ValueCounts dct_counts: Valeurs et nombres d'occurrences
+    :param str str_col_name: Nom de la colonne des valeurs
+    :param bool is_datetime: Reconvertit les valeurs ISO en datetime
+    :return str: Code HTML de la table
+    """
+    return get_counts_frame(dct_counts, str_col_name, is_datetime).to_html(
+        index=False, border=0, justify="inherit", classes="table table-sm table-hover"
+    )
+
+
+def get_repartition_graph_html(dct_profile: ColumnProfile, is_datetime: bool = False) -> str:
+    """Génère le graphique de répartition des valeurs les plus fréquentes d'une
+    colonne : barres au-delà de 5 valeurs distinctes, camembert sinon
+
+    :param ColumnProfile dct_profile: Profil de la colonne
+    :param bool is_datetime: Reconvertit les valeurs ISO en datetime
+    :return str: Code HTML du graphique (cf. `get_graph_html`)
+    """
+    import plotly.express as px
+
+    str_col_name = dct_profile["name"]
+    df = get_counts_frame(dct_profile["value_counts"], str_col_name, is_datetime)
+
+    if dct_profile["distinct_count"] > 5:
+        return get_graph_html(
+            px.bar(
+                df,
+                x=str_col_name,
+                y="Nb",
+                subtitle=f"Uniquement le top {PROFILE_MAX_VALUES} des valeurs"
+            )
+        )
+    return get_graph_html(
+        px.pie(
+            df,
+            names=str_col_name,
+            values="Nb",
+            hole=.8,
+            subtitle=f"Uniquement le top {PROFILE_MAX_VALUES} des valeurs"
+        )
+    )
+
+
 ###############################################################################
 #                                                                             #
 #                   STANDARD ANALYSIS UTILS FUNCTIONS                         #
@@ -40,6 +460,82 @@ def get_part(part_name: str, parameters: dict = {}) -> str:
 ###############################################################################
 
 
+def _top_counts(ser: pd.Series, top_n: int|None) -> pd.DataFrame:
+    """
+    Counts the values of a series and keeps the top_n most frequent ones.
+
+    Counting is done on native values (or on the codes of a categorical), and
+    the top_n winners are selected with a partial sort (np.argpartition). Only
+    these winners are converted to str for the labels, except for object
+    values: distinct values sharing a label (e.g. 1 and "1") are merged by
+    label before the selection. Missing values are not counted.
+
+    Parameters:
+    - ser (pd.Series): Series whose values are counted
+    - top_n (int|None): How many values to keep; None => keep all
+
+    Returns:
+    - pd.DataFrame with the columns [ser.name, 'count'], sorted by count descending
+    """
+    if isinstance(ser.dtype, pd.CategoricalDtype):
+        arr_codes = ser.cat.codes.to_numpy()
+        arr_nb = np.bincount(arr_codes[arr_codes != -1], minlength=len(ser.cat.categories))
+        counts = pd.Series(arr_nb, index=ser.cat.categories)
+        counts = counts[counts > 0]
+    else:
+        counts = ser.value_counts(sort=False)
+    if counts.index.dtype == object:
+        counts = counts.groupby([str(v) for v in counts.index], sort=False).sum()
+
+    arr_counts = counts.to_numpy()
+    if top_n is not None and top_n < arr_counts.shape[0]:
+        arr_idx = np.argpartition(-arr_counts, top_n - 1)[:top_n] if top_n > 0 else np.array([], dtype=int)
+    else:
+        arr_idx = np.arange(arr_counts.shape[0])
+    arr_idx = arr_idx[np.argsort(-arr_counts[arr_idx], kind="stable")]
+
+    return pd.DataFrame({
+        ser.name: [str(v) for v in counts.index[arr_idx]],
+        'count': arr_counts[arr_idx].astype(int),
+    })
+
+
+def _grouped_top_counts(df: pd.DataFrame, variable: str, by: str, top_n: int|None) -> pd.DataFrame:
+    """
+    Counts the values of a variable for every group of another variable in a
+    single groupby pass, and keeps the top_n most frequent values of each group.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame to use
+    - variable (str): Variable whose values are counted
+    - by (str): Variable defining the groups
+    - top_n (int|None): How many values to keep per group; None => keep all
+
+    Returns:
+    - pd.DataFrame with the columns [by, variable, 'count'], sorted by group
+      then by count descending. Only the kept values are converted to str
+      (object values sharing a label are merged first, cf. `_top_counts`) and
+      missing values of the variable are not counted.
+    """
+    df = df[list(dict.fromkeys([by, variable]))] # Only these two columns are copied by dropna
+    counts = df.dropna(subset=[variable]).groupby([by, variable], observed=True, dropna=False, sort=False).size()
+    if counts.index.levels[1].dtype == object:
+        counts = counts.groupby(
+            [counts.index.get_level_values(0), [str(v) for v in counts.index.get_level_values(1)]],
+            dropna=False,
+            sort=False
+        ).sum().rename_axis([by, variable])
+    counts = counts.sort_values(ascending=False, kind="stable")
+    if top_n is not None:
+        counts = counts.groupby(level=0, dropna=False, sort=False).head(top_n)
+
+    counts = counts.rename('count').reset_index()
+    counts = counts.sort_values(by, kind="stable", ignore_index=True)
+    counts[variable] = [str(v) for v in counts[variable]]
+    counts['count'] = counts['count'].astype(int)
+    return counts
+
+
 def draw_top(
     df: pd.DataFrame,
     variable: str,
@@ -47,8 +543,9 @@ def draw_top(
     thing_to_count: str|None = None,
     orient: str = 'h',
     show_labels: bool = True,
+    by: str|None = None,
     **plot_params
-) -> go.Figure:
+) -> "go.Figure":
     """
     Draws a barplot of top values for a given variable of a given dataframe using Plotly.
 
@@ -59,38 +556,33 @@ def draw_top(
     - thing_to_count (str|None): used to build the title (e.g. "Customer" -> "Customer count per ...")
     - orient (str): 'h' or 'v' (horizontal / vertical)
     - show_labels (bool): show the numeric counts on the bars
+    - by (str|None): facet variable; when given, the top values are computed for
+      every group in one groupby pass and drawn in one subplot per group
+      (stacked for 'h', side by side for 'v')
     - plot_params: passed to go.Bar (e.g. color -> marker_color)
     
     Returns:
     - plotly.graph_objects.Figure
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     def format_label(var_name:str):
         return var_name.replace("_", " ").capitalize() # Replace underscores by white spaces and make the first letter uppercase.
 
     if variable not in df.columns:
         raise ValueError(f"Variable '{variable}' not found in dataframe columns")
-
-    # Build counts DataFrame
-    counts = (
-        df[variable]
-        .astype(str)
-        .value_counts()   # sorted descending
-        .reset_index()
-        # .rename(columns={'index': variable, 'variable': 'count'})
-    )
-
-    if top_n is not None:
-        counts = counts.iloc[:top_n].copy()
-
-    
-    # Ensure count is numeric
-    counts['count'] = counts['count'].astype(int)
+    if by is not None and by not in df.columns:
+        raise ValueError(f"Variable '{by}' not found in dataframe columns")
 
     formatted_variable = format_label(variable)
     title = f"{(thing_to_count + ' ') if thing_to_count else ''}count per {formatted_variable}{f' (top {top_n})' if top_n is not None else ''}"
+    if by is not None:
+        title += f" by {format_label(by)}"
 
     # Prepare bar kwargs: allow passing 'color' to map to marker_color
     bar_kwargs = dict(plot_params)  # copy
+    bar_kwargs.pop('textposition', None)
     if 'color' in bar_kwargs:
         bar_kwargs.setdefault('marker', {})
         # if marker is dict, set color there, else set marker_color
@@ -101,7 +593,6 @@ def draw_top(
             bar_kwargs['marker_color'] = bar_kwargs.pop('color')
 
     # Text settings
-    text_vals = counts['count'].astype(str) if show_labels else None
     textposition = None
     if show_labels:
         # For vertical, place labels above bars; for horizontal, place to the right
@@ -110,61 +601,86 @@ def draw_top(
         else:
             textposition = plot_params.get('textposition', 'outside')
 
-    if orient == 'h':
-        # For horizontal bars: x=count, y=category
-        y_vals = counts[variable].tolist()
-        x_vals = counts['count'].tolist()
-
-        # Plotly lists y categories bottom->top. To show largest on top (like seaborn),
-        # reverse the lists.
-        y_vals_rev = y_vals[::-1]
-        x_vals_rev = x_vals[::-1]
-        text_vals_rev = text_vals[::-1] if show_labels else None
-
-        bar = go.Bar(
-            x=x_vals_rev,
-            y=y_vals_rev,
-            orientation='h',
-            text=text_vals_rev,
-            textposition=textposition,
-            hovertemplate='%{y}: %{x}<extra></extra>',
-            **bar_kwargs
-        )
+    def make_bar(counts: pd.DataFrame) -> tuple[go.Bar, list]:
+        """Builds the bar trace of a counts table and returns it with its category order"""
+        text_vals = counts['count'].astype(str).tolist() if show_labels else None
 
-        fig = go.Figure(data=[bar])
-        # ensure category order matches our reversed list
-        fig.update_layout(
-            yaxis = dict(categoryorder='array', categoryarray=y_vals_rev),
-            xaxis_title='Count',
-            yaxis_title=format_label(variable),
-            title=title,
-            margin=dict(l=120)  # give room for long category names
-        )
+        if orient == 'h':
+            # For horizontal bars: x=count, y=category
+            # Plotly lists y categories bottom->top. To show largest on top (like seaborn),
+            # reverse the lists.
+            y_vals_rev = counts[variable].tolist()[::-1]
+            x_vals_rev = counts['count'].tolist()[::-1]
+            text_vals_rev = text_vals[::-1] if show_labels else None
+
+            return go.Bar(
+                x=x_vals_rev,
+                y=y_vals_rev,
+                orientation='h',
+                text=text_vals_rev,
+                textposition=textposition,
+                hovertemplate='%{y}: %{x}<extra></extra>',
+                **bar_kwargs
+            ), y_vals_rev
 
-    else:
         # Vertical: x=category, y=count, keep order left->right as in counts
         x_vals = counts[variable].tolist()
-        y_vals = counts['count'].tolist()
-        bar = go.Bar(
+        return go.Bar(
             x=x_vals,
-            y=y_vals,
+            y=counts['count'].tolist(),
             orientation='v',
-            text=text_vals if show_labels else None,
+            text=text_vals,
             textposition=textposition,
             hovertemplate='%{x}: %{y}<extra></extra>',
             **bar_kwargs
-        )
+        ), x_vals
+
+    if by is None:
+        # Build counts DataFrame
+        counts = _top_counts(df[variable], top_n)
+        bar, category_order = make_bar(counts)
         fig = go.Figure(data=[bar])
+        lst_axes = [('', category_order)]
+        max_categories = len(counts)
+    else:
+        counts = _grouped_top_counts(df, variable, by, top_n)
+        groups = counts[by].drop_duplicates().tolist()
+        n_rows, n_cols = (len(groups), 1) if orient == 'h' else (1, len(groups))
+        fig = make_subplots(
+            rows=max(n_rows, 1),
+            cols=max(n_cols, 1),
+            subplot_titles=[f"{format_label(by)} = {g}" for g in groups]
+        )
+        lst_axes = []
+        for i, (_, group_counts) in enumerate(counts.groupby(by, dropna=False, sort=False)):
+            bar, category_order = make_bar(group_counts)
+            bar.showlegend = False
+            fig.add_trace(bar, row=i + 1 if orient == 'h' else 1, col=1 if orient == 'h' else i + 1)
+            lst_axes.append(('' if i == 0 else str(i + 1), category_order))
+        max_categories = int(counts.groupby(by, dropna=False).size().max()) if len(counts) else 0
+
+    if orient == 'h':
+        for axis_suffix, category_order in lst_axes:
+            # ensure category order matches our reversed list
+            fig.update_layout({f'yaxis{axis_suffix}': dict(categoryorder='array', categoryarray=category_order)})
+        fig.update_xaxes(title_text='Count')
+        fig.update_yaxes(title_text=formatted_variable)
+        fig.update_layout(
+            title=title,
+            margin=dict(l=120)  # give room for long category names
+        )
+    else:
+        for axis_suffix, category_order in lst_axes:
+            fig.update_layout({f'xaxis{axis_suffix}': dict(categoryorder='array', categoryarray=category_order)})
+        fig.update_xaxes(title_text=formatted_variable)
+        fig.update_yaxes(title_text='Count')
         fig.update_layout(
-            xaxis = dict(categoryorder='array', categoryarray=x_vals),
-            xaxis_title=format_label(variable),
-            yaxis_title='Count',
             title=title,
             margin=dict(b=120)  # room for rotated labels if needed
         )
 
     # If labels are shown and there are many categories, consider rotating labels for vertical case
-    if show_labels and orient != 'h' and len(counts) > 10:
+    if show_labels and orient != 'h' and max_categories > 10:
         fig.update_xaxes(tickangle=-45)
 
     return fig
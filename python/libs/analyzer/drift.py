@@ -0,0 +1,353 @@
+"""Comparaison (drift) entre deux profils d'un même dataset
+
+Les indicateurs sont calculés uniquement à partir des profils sauvegardés
+(`save_profile`) : esquisse de quantiles pour les colonnes numériques et
+datetime, fréquences des valeurs pour les autres, taux de valeurs nulles et
+nombre de lignes. Les données brutes ne sont jamais relues.
+
+- PSI (Population Stability Index) : sur les déciles de la référence pour les
+  colonnes numériques, sur les modalités pour les autres
+- KS : écart maximal entre les fonctions de répartition reconstruites à
+  partir des esquisses de quantiles (colonnes numériques et datetime)
+- JS : divergence de Jensen-Shannon (base 2, entre 0 et 1) sur les mêmes
+  intervalles / modalités que le PSI
+"""
+import os
+import html
+import numpy as np
+import pandas as pd
+
+from .commons import ColumnProfile, DatasetProfile, get_part, get_graph_html, get_plot_templates_json
+from .profile import load_profile
+
+DRIFT_EPSILON = 1e-4 # Proportion minimale d'un intervalle/modalité (évite log(0) dans le PSI)
+DRIFT_PSI_THRESHOLDS = (0.1, 0.25) # Seuils usuels du PSI : stable / modéré / fort
+DRIFT_OTHER_LABEL = "(autres)" # Modalité regroupant les valeurs hors du top conservé dans le profil
+DRIFT_PLOT_CATEGORIES = 20 # Nombre de modalités affichées dans le graphique d'une colonne
+
+
+def _sketch_to_numeric(arr_quantiles: list, bool_datetime: bool) -> np.ndarray:
+    """Convertit une esquisse de quantiles en tableau numérique (ns depuis epoch
+    pour les datetime)
+
+    :param list arr_quantiles: Quantiles du profil
+    :param bool bool_datetime: Les quantiles sont des dates ISO
+    :return np.ndarray: Quantiles en float, sans les valeurs nulles
+    """
+    arr_quantiles = [v for v in arr_quantiles if v is not None]
+    if bool_datetime:
+        return pd.to_datetime(pd.Series(arr_quantiles, dtype=object), format="ISO8601").to_numpy("datetime64[ns]").astype("int64").astype(float)
+    return np.asarray(arr_quantiles, dtype=float)
+
+
+def _sketch_cdf(arr_quantiles: np.ndarray, arr_x: np.ndarray) -> np.ndarray:
+    """Évalue la fonction de répartition reconstruite à partir d'une esquisse
+    de quantiles régulièrement espacés (interpolation linéaire entre quantiles,
+    les quantiles égaux - valeurs discrètes - formant un saut)
+
+    :param np.ndarray arr_quantiles: Quantiles de 0 à 1, triés
+    :param np.ndarray arr_x: Points d'évaluation
+    :return np.ndarray: F(x) pour chaque point
+    """
+    arr_p = np.linspace(0, 1, arr_quantiles.shape[0])
+    # Pour chaque valeur distincte, la probabilité cumulée la plus haute
+    arr_values, arr_last = np.unique(arr_quantiles[::-1], return_index=True)
+    arr_p_last = arr_p[::-1][arr_last]
+    if arr_values.shape[0] == 1:
+        return (arr_x >= arr_values[0]).astype(float)
+    return np.interp(arr_x, arr_values, arr_p_last, left=0.0, right=1.0)
+
+
+def _psi(arr_ref: np.ndarray, arr_cur: np.ndarray) -> float:
+    """Population Stability Index entre deux distributions discrètes
+
+    :param np.ndarray arr_ref: Proportions de la référence
+    :param np.ndarray arr_cur: Proportions courantes
+    :return float: PSI
+    """
+    arr_ref = np.clip(arr_ref, DRIFT_EPSILON, None)
+    arr_cur = np.clip(arr_cur, DRIFT_EPSILON, None)
+    return float(np.sum((arr_cur - arr_ref) * np.log(arr_cur / arr_ref)))
+
+
+def _jensen_shannon(arr_ref: np.ndarray, arr_cur: np.ndarray) -> float:
+    """Divergence de Jensen-Shannon (base 2) entre deux distributions discrètes
+
+    :param np.ndarray arr_ref: Proportions de la référence
+    :param np.ndarray arr_cur: Proportions courantes
+    :return float: Divergence entre 0 (identiques) et 1 (disjointes)
+    """
+    arr_ref = arr_ref / arr_ref.sum()
+    arr_cur = arr_cur / arr_cur.sum()
+    arr_mid = (arr_ref + arr_cur) / 2
+
+    def _kl(arr_p: np.ndarray) -> float:
+        mask = arr_p > 0
+        return float(np.sum(arr_p[mask] * np.log2(arr_p[mask] / arr_mid[mask])))
+
+    return (_kl(arr_ref) + _kl(arr_cur)) / 2
+
+
+def _numeric_drift(dct_ref: ColumnProfile, dct_cur: ColumnProfile) -> dict:
+    """Indicateurs de drift d'une colonne numérique/datetime à partir des esquisses
+
+    :param ColumnProfile dct_ref: Profil de référence
+    :param ColumnProfile dct_cur: Profil courant
+    :return dict: PSI, KS, JS et les points des deux fonctions de répartition
+    """
+    bool_datetime = dct_ref["kind"] == "datetime"
+    arr_ref = _sketch_to_numeric(dct_ref["quantiles"], bool_datetime)
+    arr_cur = _sketch_to_numeric(dct_cur["quantiles"], bool_datetime)
+    if arr_ref.shape[0] < 2 or arr_cur.shape[0] < 2:
+        return {"PSI": np.nan, "KS": np.nan, "JS": np.nan}
+
+    # KS : écart maximal entre les deux fonctions de répartition
+    arr_x = np.union1d(arr_ref, arr_cur)
+    arr_f_ref = _sketch_cdf(arr_ref, arr_x)
+    arr_f_cur = _sketch_cdf(arr_cur, arr_x)
+
+    # PSI / JS : intervalles définis par les déciles de la référence
+    arr_edges = np.unique(np.quantile(arr_ref, np.linspace(0.1, 0.9, 9)))
+    arr_p_ref = np.diff(np.concatenate([[0.0], _sketch_cdf(arr_ref, arr_edges), [1.0]]))
+    arr_p_cur = np.diff(np.concatenate([[0.0], _sketch_cdf(arr_cur, arr_edges), [1.0]]))
+
+    return {
+        "PSI": _psi(arr_p_ref, arr_p_cur),
+        "KS": float(np.max(np.abs(arr_f_ref - arr_f_cur))),
+        "JS": _jensen_shannon(arr_p_ref, arr_p_cur),
+        "x": arr_x,
+        "ref": arr_f_ref,
+        "cur": arr_f_cur,
+    }
+
+
+def _categorical_drift(dct_ref: ColumnProfile, dct_cur: ColumnProfile) -> dict:
+    """Indicateurs de drift d'une colonne à partir des fréquences des valeurs.
+    Les valeurs hors du top conservé dans les profils sont regroupées
+
+    :param ColumnProfile dct_ref: Profil de référence
+    :param ColumnProfile dct_cur: Profil courant
+    :return dict: PSI, JS et les proportions des deux profils par modalité
+    """
+    def _frequencies(dct_profile: ColumnProfile) -> pd.Series:
+        ser = pd.Series(
+            dct_profile["value_counts"]["counts"],
+            index=[str(v) for v in dct_profile["value_counts"]["values"]],
+            dtype=float
+        )
+        ser = ser.groupby(level=0).sum()
+        ser[DRIFT_OTHER_LABEL] = max(dct_profile["count"] - ser.sum(), 0)
+        return ser
+
+    ser_ref = _frequencies(dct_ref)
+    ser_cur = _frequencies(dct_cur)
+    if ser_ref.sum() == 0 or ser_cur.sum() == 0:
+        return {"PSI": np.nan, "KS": np.nan, "JS": np.nan}
+
+    df_freq = pd.concat([ser_ref.rename("ref"), ser_cur.rename("cur")], axis=1).fillna(0.0)
+    df_freq = df_freq[(df_freq["ref"] > 0) | (df_freq["cur"] > 0)]
+    df_freq = df_freq / df_freq.sum()
+
+    arr_p_ref = df_freq["ref"].to_numpy()
+    arr_p_cur = df_freq["cur"].to_numpy()
+    return {
+        "PSI": _psi(arr_p_ref, arr_p_cur),
+        "KS": np.nan,
+        "JS": _jensen_shannon(arr_p_ref, arr_p_cur),
+        "frequencies": df_freq,
+    }
+
+
+def _drift_level(flt_psi: float) -> str:
+    """Niveau de drift à partir du PSI
+
+    :param float flt_psi: PSI
+    :return str: `"Stable"`, `"Modéré"`, `"Fort"` ou `""` si non calculable
+    """
+    if np.isnan(flt_psi):
+        return ""
+    if flt_psi < DRIFT_PSI_THRESHOLDS[0]:
+        return "Stable"
+    if flt_psi < DRIFT_PSI_THRESHOLDS[1]:
+        return "Modéré"
+    return "Fort"
+
+
+def _null_rate(dct_profile: ColumnProfile) -> float:
+    """Taux de valeurs nulles d'une colonne
+
+    :param ColumnProfile dct_profile: Profil de la colonne
+    :return float: Taux entre 0 et 1 (NaN si la colonne est vide)
+    """
+    int_total = dct_profile["count"] + dct_profile["null_count"]
+    return dct_profile["null_count"] / int_total if int_total > 0 else np.nan
+
+
+def _compare(dct_ref: DatasetProfile, dct_cur: DatasetProfile) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """Compare deux profils colonne par colonne
+
+    :param DatasetProfile dct_ref: Profil de référence
+    :param DatasetProfile dct_cur: Profil courant
+    :return tuple[pd.DataFrame, dict[str, dict]]: Table des indicateurs, triée
+        par drift décroissant, et détails (courbes/fréquences) par colonne
+    """
+    dct_ref_cols = {c["name"]: c for c in dct_ref["columns"]}
+    dct_cur_cols = {c["name"]: c for c in dct_cur["columns"]}
+    arr_names = list(dct_ref_cols) + [c for c in dct_cur_cols if c not in dct_ref_cols]
+
+    arr_rows = []
+    dct_details = {}
+    for str_col in arr_names:
+        dct_ref_col = dct_ref_cols.get(str_col)
+        dct_cur_col = dct_cur_cols.get(str_col)
+        dct_row = {
+            "Colonnes": str_col,
+            "dtype": (dct_cur_col or dct_ref_col)["dtype"],
+            "PSI": np.nan,
+            "KS": np.nan,
+            "JS": np.nan,
+            "Nulls réf.": np.nan if dct_ref_col is None else _null_rate(dct_ref_col),
+            "Nulls courant": np.nan if dct_cur_col is None else _null_rate(dct_cur_col),
+            "Niveau": "",
+        }
+
+        if dct_ref_col is None:
+            dct_row["Niveau"] = "Nouvelle colonne"
+        elif dct_cur_col is None:
+            dct_row["Niveau"] = "Colonne supprimée"
+        elif dct_ref_col["kind"] != dct_cur_col["kind"]:
+            dct_row["Niveau"] = f"Type modifié ({dct_ref_col['dtype']} → {dct_cur_col['dtype']})"
+        else:
+            if dct_ref_col["kind"] in ("numeral", "datetime") and dct_ref_col.get("quantiles") and dct_cur_col.get("quantiles"):
+                dct_detail = _numeric_drift(dct_ref_col, dct_cur_col)
+            else:
+                dct_detail = _categorical_drift(dct_ref_col, dct_cur_col)
+            dct_row["PSI"] = dct_detail["PSI"]
+            dct_row["KS"] = dct_detail["KS"]
+            dct_row["JS"] = dct_detail["JS"]
+            dct_row["Niveau"] = _drift_level(dct_detail["PSI"])
+            dct_details[str_col] = dct_detail
+
+        dct_row["Δ Nulls"] = dct_row["Nulls courant"] - dct_row["Nulls réf."]
+        arr_rows.append(dct_row)
+
+    df_drift = pd.DataFrame(arr_rows, columns=["Colonnes", "dtype", "Niveau", "PSI", "KS", "JS", "Nulls réf.", "Nulls courant", "Δ Nulls"])
+    # Colonnes nouvelles/supprimées/modifiées en premier, puis par PSI décroissant
+    df_drift["_structural"] = df_drift["PSI"].isna() & (df_drift["Niveau"] != "")
+    df_drift = df_drift.sort_values(["_structural", "PSI", "JS"], ascending=[False, False, False], na_position="last", ignore_index=True)
+    return df_drift.drop(columns="_structural"), dct_details
+
+
+def compare_profiles(dct_ref: DatasetProfile, dct_cur: DatasetProfile) -> pd.DataFrame:
+    """Compare deux profils d'un même dataset (ex: extraction de la veille et du
+    jour) et retourne les indicateurs de drift de chaque colonne
+
+    :param DatasetProfile dct_ref: Profil de référence
+    :param DatasetProfile dct_cur: Profil courant
+    :return pd.DataFrame: Une ligne par colonne (PSI, KS, JS, taux de nulls et
+        niveau de drift), triée par drift décroissant
+    """
+    return _compare(dct_ref, dct_cur)[0]
+
+
+def _get_drift_graph_html(str_col: str, dct_detail: dict, bool_datetime: bool) -> str:
+    """Graphique de comparaison d'une colonne : fonctions de répartition pour
+    les colonnes numériques, proportions des principales modalités sinon
+
+    :param str str_col: Nom de la colonne
+    :param dict dct_detail: Détails calculés par `_numeric_drift`/`_categorical_drift`
+    :param bool bool_datetime: Les abscisses sont des dates (ns depuis epoch)
+    :return str: Code HTML du graphique
+    """
+    import plotly.graph_objects as go
+
+    if "x" in dct_detail:
+        arr_x = dct_detail["x"]
+        if bool_datetime:
+            arr_x = pd.to_datetime(arr_x.astype("int64"))
+        fig = go.Figure([
+            go.Scatter(x=arr_x, y=dct_detail["ref"], mode="lines", name="Référence"),
+            go.Scatter(x=arr_x, y=dct_detail["cur"], mode="lines", name="Courant"),
+        ])
+        fig.update_layout(template="plotly_white", title="Fonction de répartition", xaxis_title=str_col, yaxis_title="Proportion cumulée")
+    elif "frequencies" in dct_detail:
+        df_freq = dct_detail["frequencies"]
+        df_freq = df_freq.loc[df_freq.max(axis=1).sort_values(ascending=False).index[:DRIFT_PLOT_CATEGORIES]]
+        fig = go.Figure([
+            go.Bar(x=df_freq.index, y=df_freq["ref"], name="Référence"),
+            go.Bar(x=df_freq.index, y=df_freq["cur"], name="Courant"),
+        ])
+        fig.update_layout(
+            template="plotly_white",
+            barmode="group",
+            title=f"Proportions (top {DRIFT_PLOT_CATEGORIES} des valeurs)",
+            xaxis_title=str_col,
+            yaxis_title="Proportion"
+        )
+    else:
+        return ""
+    return get_graph_html(fig)
+
+
+def drift_report(
+    ref: DatasetProfile | str,
+    cur: DatasetProfile | str,
+    output_dir: str = "analyzer",
+    output_name: str = "drift"
+) -> pd.DataFrame:
+    """Génère une page HTML de drift entre deux profils, classée par drift
+    décroissant, et retourne la table des indicateurs
+
+    :param DatasetProfile | str ref: Profil de référence ou chemin vers un profil sauvegardé
+    :param DatasetProfile | str cur: Profil courant ou chemin vers un profil sauvegardé
+    :param str, optional output_dir: Nom du dossier d'output, defaults to "analyzer"
+    :param str, optional output_name: Nom du fichier d'output, defaults to "drift"
+    :return pd.DataFrame: Table des indicateurs (cf. `compare_profiles`)
+    """
+    dct_ref = load_profile(ref) if isinstance(ref, str) else ref
+    dct_cur = load_profile(cur) if isinstance(cur, str) else cur
+    df_drift, dct_details = _compare(dct_ref, dct_cur)
+    dct_kinds = {c["name"]: c["kind"] for c in dct_ref["columns"]}
+
+    str_output = ""
+    for row in df_drift.itertuples(index=False):
+        str_col = row.Colonnes
+        if str_col not in dct_details:
+            continue
+        str_output += get_part(
+            "drift_column",
+            {
+                "COL_TITLE": html.escape(str_col),
+                "COL_TYPE": row.dtype,
+                "LEVEL": row.Niveau,
+                "GRAPH_HTML": _get_drift_graph_html(str_col, dct_details[str_col], dct_kinds[str_col] == "datetime"),
+                "PSI": f"{row.PSI:.4f}",
+                "KS": "" if np.isnan(row.KS) else f"{row.KS:.4f}",
+                "JS": f"{row.JS:.4f}",
+            }
+        )
+        str_output += "<hr>"
+
+    if os.path.exists(os.path.join(output_dir, f"{output_name}.html")):
+        os.remove(os.path.join(output_dir, f"{output_name}.html"))
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    with open(os.path.join(output_dir, f"{output_name}.html"), mode="w", encoding="utf-8") as f:
+        f.write(
+            get_part(
+                "drift",
+                {
+                    "TITLE": output_name,
+                    "REF_NAME": html.escape(dct_ref["name"]),
+                    "CUR_NAME": html.escape(dct_cur["name"]),
+                    "REF_ROW_COUNT": dct_ref["row_count"],
+                    "CUR_ROW_COUNT": dct_cur["row_count"],
+                    "SUMMARY": df_drift.to_html(index=False, border=0, justify="inherit", float_format="{:.4f}".format, na_rep="", classes="table table-sm table-hover"),
+                    "CONTENT": str_output,
+                    "PLOTS_SCRIPT": get_part("plots_script", {"PLOT_TEMPLATES": get_plot_templates_json()})
+                }
+            )
+        )
+
+    return df_drift
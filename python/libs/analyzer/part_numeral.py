@@ -1,32 +1,49 @@
 """Analyse d'une colonne de numeral"""
+import numpy as np
 import pandas as pd
-import plotly.express as px
-from .commons import get_part
+from .commons import (
+    ColumnProfile, get_part, get_graph_html, get_base_profile, get_key_figures, get_quantiles, to_json_value,
+    get_counts_table_html, get_repartition_graph_html
+)
 
-def analyse_numeral(ser: pd.Series, type_name: str) -> str:
-    """Analyse d'une colonne/series de type numeral (float, int, etc...). N'importe quel numeral
-    peut fonctionner
+def profile_numeral(ser: pd.Series) -> ColumnProfile:
+    """Profil d'une colonne/series de type numeral (float, int, etc...).
+    L'histogramme (50 intervalles) est pré-calculé sur les valeurs finies
 
-    :param pd.Series ser: Serie à analyser
-    :param str type_name: Type exact de la colonne passée (différents numeral
-    peuvent être passés ici)
-    :return str: Code HTML généré en se basant sur le template "numeral"
+    :param pd.Series ser: Serie à profiler
+    :return ColumnProfile: Profil de la colonne
     """
-    df = pd.DataFrame(ser)
+    dct_profile = get_base_profile(ser, "numeral")
+    dct_profile["stats"] = {k: to_json_value(v) for k, v in get_key_figures(ser).items()}
+    dct_profile["quantiles"] = [to_json_value(v) for v in get_quantiles(ser)]
 
-    str_col_name = df.columns[0]
+    arr_values = ser.dropna().to_numpy(dtype=float)
+    arr_values = arr_values[np.isfinite(arr_values)]
+    if arr_values.shape[0] > 0:
+        arr_nb, arr_edges = np.histogram(arr_values, bins=50)
+        dct_profile["histogram"] = {"edges": arr_edges.tolist(), "counts": arr_nb.tolist()}
 
-    # table des valeurs pour top/flop
-    df_repartition = df[str_col_name].value_counts().reset_index().rename(columns={"count": "Nb"})
+    return dct_profile
 
-    if df_repartition[str_col_name].unique().shape[0] > 5:
-        dt_mean: float = df[str_col_name].mean()
-        dt_min: float = df[str_col_name].min()
-        dt_qt1: float = df[str_col_name].quantile(0.25)
-        dt_qt2: float = df[str_col_name].quantile(0.50)
-        dt_qt3: float = df[str_col_name].quantile(0.75)
-        dt_max: float = df[str_col_name].max()
 
+def render_numeral(dct_profile: ColumnProfile) -> str:
+    """Rendu HTML du profil d'une colonne de type numeral
+
+    :param ColumnProfile dct_profile: Profil de la colonne
+    :return str: Code HTML généré en se basant sur le template "numeral"
+    """
+    import plotly.graph_objects as go
+
+    str_col_name = dct_profile["name"]
+    dct_stats = {k: np.nan if v is None else v for k, v in dct_profile["stats"].items()}
+    dt_mean: float = dct_stats["mean"]
+    dt_min: float = dct_stats["min"]
+    dt_qt1: float = dct_stats["qt1"]
+    dt_qt2: float = dct_stats["qt2"]
+    dt_qt3: float = dct_stats["qt3"]
+    dt_max: float = dct_stats["max"]
+
+    if dct_profile["distinct_count"] > 5 and dct_profile["histogram"] is not None:
         # Histogramme avec lignes pour min / qt1 / median / mean / qt3 / max
         # couleurs soft (alignées avec style doux du site)
         color_hist = "#cfe8ff"    # pale blue for bars
@@ -35,11 +52,19 @@ def analyse_numeral(ser: pd.Series, type_name: str) -> str:
         color_max = "#fc8d62"     # soft orange for max
         color_q = "#8da0cb"       # soft purple for quantiles
         
-        fig = px.histogram(
-            df,
-            x=str_col_name,
-            nbins=50,
-            opacity=0.9
+        # Histogramme pré-calculé : seuls les 50 intervalles sont embarqués dans
+        # le rapport, et non l'ensemble des valeurs de la colonne
+        arr_nb = np.asarray(dct_profile["histogram"]["counts"])
+        arr_edges = np.asarray(dct_profile["histogram"]["edges"], dtype=float)
+        fig = go.Figure(
+            go.Bar(
+                x=(arr_edges[:-1] + arr_edges[1:]) / 2,
+                y=arr_nb,
+                width=np.diff(arr_edges),
+                customdata=np.column_stack([arr_edges[:-1], arr_edges[1:]]),
+                hovertemplate="[%{customdata[0]:,.2f} ; %{customdata[1]:,.2f}] : %{y}<extra></extra>",
+                opacity=0.9
+            )
         )
         fig.update_traces(marker_color=color_hist, marker_line_width=0)
         fig.update_layout(
@@ -68,27 +93,18 @@ def analyse_numeral(ser: pd.Series, type_name: str) -> str:
         _add_line(dt_qt3, "Q3", color_q)
         _add_line(dt_max, "Max", color_max)
 
-        str_graph_repartition = fig.to_html(include_plotlyjs=False, full_html=False)
+        str_graph_repartition = get_graph_html(fig)
     else:
-        str_graph_repartition = px.pie(
-            df_repartition[:1000],
-            names=str_col_name,
-            values="Nb",
-            hole=.8,
-            subtitle="Uniquement le top 1000 des valeurs"
-        ).to_html(
-            include_plotlyjs=False,
-            full_html=False            
-        )
+        str_graph_repartition = get_repartition_graph_html(dct_profile)
 
     return get_part(
         "numeral",
         {
             "COL_TITLE": str_col_name,
-            "COL_TYPE": type_name,
+            "COL_TYPE": dct_profile["dtype"],
             "GRAPH_HTML": str_graph_repartition,
-            "TOP5_TABLE": df_repartition.sort_values("Nb", ascending=False)[:5].to_html(index=False, border=0, justify="inherit", classes="table table-sm table-hover"),
-            "FLOP5_TABLE": df_repartition.sort_values("Nb")[:5].to_html(index=False, border=0, justify="inherit", classes="table table-sm table-hover"),
+            "TOP5_TABLE": get_counts_table_html(dct_profile["top"], str_col_name),
+            "FLOP5_TABLE": get_counts_table_html(dct_profile["flop"], str_col_name),
             "DT_MEAN": f"{dt_mean:,.2f}".replace(",", " "),
             "DT_MIN": f"{dt_min:,.2f}".replace(",", " "),
             "DT_QT1": f"{dt_qt1:,.2f}".replace(",", " "),
@@ -96,4 +112,18 @@ def analyse_numeral(ser: pd.Series, type_name: str) -> str:
             "DT_QT3": f"{dt_qt3:,.2f}".replace(",", " "),
             "DT_MAX": f"{dt_max:,.2f}".replace(",", " ")
         }
-    )
\ No newline at end of file
+    )
+
+
+def analyse_numeral(ser: pd.Series, type_name: str) -> str:
+    """Analyse d'une colonne/series de type numeral (float, int, etc...). N'importe quel numeral
+    peut fonctionner
+
+    :param pd.Series ser: Serie à analyser
+    :param str type_name: Type exact de la colonne passée (différents numeral
+    peuvent être passés ici)
+    :return str: Code HTML généré en se basant sur le template "numeral"
+    """
+    dct_profile = profile_numeral(ser)
+    dct_profile["dtype"] = type_name
+    return render_numeral(dct_profile)
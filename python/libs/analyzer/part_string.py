@@ -1,49 +1,39 @@
 """Analyse d'une colonne string"""
 import pandas as pd
-import plotly.express as px
-from .commons import get_part
+from .commons import ColumnProfile, get_part, get_base_profile, get_counts_table_html, get_repartition_graph_html
 
-def analyse_string(ser: pd.Series) -> str:
-    """Analyse d'une colonne/series string
+def profile_string(ser: pd.Series) -> ColumnProfile:
+    """Profil d'une colonne/series string
 
-    :param pd.Series ser: Serie à analyser
-    :return str: Code HTML généré en se basant sur le template "string"
+    :param pd.Series ser: Serie à profiler
+    :return ColumnProfile: Profil de la colonne
     """
-    df = pd.DataFrame(ser)
-
-    str_col_name = df.columns[0]
-
-    df = df[str_col_name].value_counts().reset_index().rename(columns={"count": "Nb"})
-    str_graph_repartition: str
-    if df[str_col_name].unique().shape[0] > 5:
-        str_graph_repartition = px.bar(
-            df[:1000],
-            x=str_col_name,
-            y="Nb",
-            subtitle="Uniquement le top 1000 des valeurs"
-        ).to_html(
-            include_plotlyjs=False,
-            full_html=False
-        )
-    else:
-        str_graph_repartition = px.pie(
-            df[:1000],
-            names=str_col_name,
-            values="Nb",
-            hole=.8,
-            subtitle="Uniquement le top 1000 des valeurs"
-        ).to_html(
-            include_plotlyjs=False,
-            full_html=False
-        )
+    return get_base_profile(ser, "string")
 
 
+def render_string(dct_profile: ColumnProfile) -> str:
+    """Rendu HTML du profil d'une colonne string
+
+    :param ColumnProfile dct_profile: Profil de la colonne
+    :return str: Code HTML généré en se basant sur le template "string"
+    """
+    str_col_name = dct_profile["name"]
+
     return get_part(
         "string",
         {
             "COL_TITLE": str_col_name,
-            "GRAPH_HTML": str_graph_repartition,
-            "TOP5_TABLE": df.sort_values("Nb", ascending=False)[:5].to_html(index=False, border=0, justify="inherit", classes="table table-sm table-hover"),
-            "FLOP5_TABLE": df.sort_values("Nb")[:5].to_html(index=False, border=0, justify="inherit", classes="table table-sm table-hover"),
+            "GRAPH_HTML": get_repartition_graph_html(dct_profile),
+            "TOP5_TABLE": get_counts_table_html(dct_profile["top"], str_col_name),
+            "FLOP5_TABLE": get_counts_table_html(dct_profile["flop"], str_col_name),
         }
     )
+
+
+def analyse_string(ser: pd.Series) -> str:
+    """Analyse d'une colonne/series string
+
+    :param pd.Series ser: Serie à analyser
+    :return str: Code HTML généré en se basant sur le template "string"
+    """
+    return render_string(profile_string(ser))
@@ -0,0 +1,128 @@
+"""Profil sérialisable d'un dataframe, indépendant du rendu HTML
+
+Un profil (`DatasetProfile`) contient les statistiques de chaque colonne. Il
+peut être calculé une fois sur la machine qui a accès aux données, sauvegardé
+en JSON ou en Parquet, puis rendu (ou re-rendu) ailleurs avec
+`render_profile`, sans relire les données brutes.
+"""
+import os
+import json
+import pandas as pd
+
+from .commons import ColumnProfile, DatasetProfile, PROFILE_VERSION, get_column_kind
+from .part_string import profile_string
+from .part_datetime import profile_datetime
+from .part_numeral import profile_numeral
+from .part_default import profile_default
+
+PROFILE_NESTED_FIELDS = ("stats", "value_counts", "top", "flop", "histogram", "quantiles") # Champs stockés en JSON dans un profil Parquet
+
+
+def profile_column(ser: pd.Series) -> ColumnProfile:
+    """Calcule le profil d'une colonne en choisissant la partie correspondant
+    à son dtype
+
+    :param pd.Series ser: Serie à profiler
+    :return ColumnProfile: Profil de la colonne
+    """
+    str_kind = get_column_kind(ser.dtype)
+
+    if str_kind == "string":
+        return profile_string(ser)
+    elif str_kind == "datetime":
+        return profile_datetime(ser)
+    elif str_kind == "numeral":
+        return profile_numeral(ser)
+    else:
+        return profile_default(ser)
+
+
+def profile_dataframe(df: pd.DataFrame, name: str = "", max_workers: int = 1) -> DatasetProfile:
+    """Calcule le profil de toutes les colonnes d'un dataframe
+
+    :param pd.DataFrame df: Dataframe à profiler
+    :param str, optional name: Nom du dataset, defaults to ""
+    :param int, optional max_workers: Nombre de processus utilisés pour
+        profiler les colonnes en parallèle, defaults to 1
+    :return DatasetProfile: Profil du dataframe
+    """
+    n_jobs = max(1, min(max_workers, df.shape[1]))
+    if n_jobs > 1:
+        import joblib
+
+        n_jobs = min(n_jobs, joblib.cpu_count())
+
+    if n_jobs == 1:
+        arr_columns = [profile_column(df.iloc[:, int_col]) for int_col in range(df.shape[1])]
+    else:
+        arr_columns = joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(profile_column)(df.iloc[:, int_col]) for int_col in range(df.shape[1])
+        )
+
+    return {
+        "version": PROFILE_VERSION,
+        "name": name,
+        "row_count": int(df.shape[0]),
+        "col_count": int(df.shape[1]),
+        "columns": arr_columns,
+    }
+
+
+def save_profile(dct_profile: DatasetProfile, str_path: str) -> None:
+    """Sauvegarde un profil en JSON (`.json`) ou en Parquet (`.parquet`).
+    En Parquet, chaque colonne profilée est une ligne ; les champs imbriqués
+    sont stockés en JSON et les informations du dataset dans les métadonnées
+
+    :param DatasetProfile dct_profile: Profil à sauvegarder
+    :param str str_path: Chemin du fichier
+    """
+    str_dir = os.path.dirname(str_path)
+    if str_dir and not os.path.exists(str_dir):
+        os.makedirs(str_dir)
+
+    if str_path.lower().endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        df_columns = pd.DataFrame(dct_profile["columns"], columns=list(ColumnProfile.__annotations__))
+        for str_field in PROFILE_NESTED_FIELDS:
+            df_columns[str_field] = [json.dumps(v, ensure_ascii=False, allow_nan=False) for v in df_columns[str_field]]
+        dct_meta = {k: v for k, v in dct_profile.items() if k != "columns"}
+
+        table = pa.Table.from_pandas(df_columns, preserve_index=False)
+        table = table.replace_schema_metadata({"profile": json.dumps(dct_meta, ensure_ascii=False, allow_nan=False)})
+        pq.write_table(table, str_path)
+        return
+
+    with open(str_path, mode="w", encoding="utf-8") as f:
+        json.dump(dct_profile, f, ensure_ascii=False, allow_nan=False)
+
+
+def load_profile(str_path: str) -> DatasetProfile:
+    """Charge un profil sauvegardé avec `save_profile`
+
+    :param str str_path: Chemin du fichier (`.json` ou `.parquet`)
+    :return DatasetProfile: Le profil
+    """
+    if str_path.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(str_path)
+        dct_profile = json.loads(table.schema.metadata[b"profile"])
+        arr_columns = table.to_pylist()
+        for dct_column in arr_columns:
+            for str_field in PROFILE_NESTED_FIELDS:
+                if str_field in dct_column:
+                    dct_column[str_field] = json.loads(dct_column[str_field])
+        dct_profile["columns"] = arr_columns
+    else:
+        with open(str_path, mode="r", encoding="utf-8") as f:
+            dct_profile = json.load(f)
+
+    if dct_profile.get("version") not in range(1, PROFILE_VERSION + 1):
+        raise ValueError(f"Version de profil {dct_profile.get('version')} non supportée (attendue: {PROFILE_VERSION})")
+
+    # Version 1 : pas d'esquisse de quantiles
+    for dct_column in dct_profile["columns"]:
+        dct_column.setdefault("quantiles", None)
+    return dct_profile
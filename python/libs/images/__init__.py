@@ -0,0 +1,32 @@
+"""Traitements de dossiers d'images. Les sous-modules (et leurs dépendances :
+NumPy, pandas, Pillow) ne sont importés qu'au premier accès à l'un de leurs noms"""
+import importlib
+
+_SUBMODULES = ("features", "metadata")
+
+_EXPORTS = {
+    "load_image": "features",
+    "color_histogram_extractor": "features",
+    "FeatureCache": "features",
+    "extract_features": "features",
+    "get_phash": "metadata",
+    "read_image_metadata": "metadata",
+    "find_near_duplicates": "metadata",
+    "profile_images": "metadata",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__ + list(_SUBMODULES))
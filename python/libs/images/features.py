@@ -0,0 +1,394 @@
+"""Extraction de features d'images par lots, avec cache disque
+
+Exemple (modèle Keras pré-entraîné, cf. notebook de transfer learning) :
+
+    model = VGG16(weights="imagenet", include_top=False, pooling="avg")
+    arr_features = extract_features(
+        data["image_path"].tolist(),
+        lambda arr_batch: model.predict(preprocess_input(arr_batch), verbose=0),
+        batch_size=64,
+        cache_dir="cache/vgg16_224",
+    )
+
+Les images sont décodées et redimensionnées dans un pool de threads (ou de
+processus) pendant que l'extracteur traite le lot précédent. L'extracteur
+reçoit des lots de taille fixe `(batch_size, hauteur, largeur, 3)` en float32,
+comme `img_to_array`, et retourne une ligne de features par image. Avec
+`cache_dir`, les features sont conservées dans un fichier `.npy` ouvert en
+memmap, indexé par chemin, date de modification et taille du fichier : une
+nouvelle exécution ne traite que les images nouvelles ou modifiées.
+
+`color_histogram_extractor` est un extracteur NumPy sans poids à télécharger,
+utilisable hors ligne comme modèle de substitution.
+"""
+import os
+import json
+import multiprocessing
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+
+from ..utils.file_system import get_files
+
+CACHE_FEATURES_FILE = "features.npy" # Matrice des features (memmap) dans le dossier de cache
+CACHE_INDEX_FILE = "index.json" # Index chemin -> (mtime, taille, ligne) dans le dossier de cache
+CACHE_MIN_CAPACITY = 1024 # Nombre de lignes allouées à la création du cache (doublé à chaque agrandissement)
+
+
+###############################################################################
+#                                                                             #
+#                              DÉCODAGE                                       #
+#                                                                             #
+###############################################################################
+
+
+def load_image(
+    str_path: str,
+    target_size: tuple[int, int] = (224, 224),
+    resample: str = "nearest",
+    draft: bool = False
+) -> np.ndarray:
+    """Décode une image en RGB et la redimensionne. Par défaut, les pixels sont
+    identiques à ceux de `load_img` (Keras)
+
+    :param str str_path: Chemin de l'image
+    :param tuple[int, int], optional target_size: Taille cible (hauteur, largeur),
+        comme `load_img`, defaults to (224, 224)
+    :param str, optional resample: Méthode de rééchantillonnage PIL ("nearest",
+        "bilinear", "bicubic", ...), "nearest" comme `load_img`, defaults to "nearest"
+    :param bool, optional draft: Pour les JPEG, le décodeur réduit directement
+        l'image (`Image.draft`) au plus petit multiple de la taille cible, ce
+        qui évite de décoder les pixels en pleine résolution. Plus rapide, mais
+        les pixels diffèrent légèrement de ceux de `load_img`, defaults to False
+    :return np.ndarray: Image `(hauteur, largeur, 3)` en uint8
+    """
+    from PIL import Image
+
+    int_height, int_width = target_size
+    with Image.open(str_path) as img:
+        if draft:
+            img.draft("RGB", (int_width, int_height))
+        img = img.convert("RGB")
+        if img.size != (int_width, int_height):
+            img = img.resize((int_width, int_height), Image.Resampling[resample.upper()])
+        return np.asarray(img, dtype=np.uint8)
+
+
+def _load_image_safe(str_path: str, target_size: tuple[int, int], resample: str, draft: bool) -> tuple[np.ndarray | None, str | None]:
+    """`load_image` qui retourne l'erreur au lieu de la lever (fichier corrompu,
+    format inconnu, ...), pour ne pas interrompre un lot
+
+    :return tuple[np.ndarray | None, str | None]: Image ou None, message d'erreur ou None
+    """
+    try:
+        return load_image(str_path, target_size, resample, draft), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+###############################################################################
+#                                                                             #
+#                              EXTRACTEURS                                    #
+#                                                                             #
+###############################################################################
+
+
+def color_histogram_extractor(arr_batch: np.ndarray, int_bins: int = 8) -> np.ndarray:
+    """Extracteur de substitution : histogramme normalisé de chaque canal.
+    Déterministe, sans dépendance ni poids à télécharger
+
+    :param np.ndarray arr_batch: Lot d'images `(n, hauteur, largeur, 3)`, valeurs 0..255
+    :param int, optional int_bins: Nombre d'intervalles par canal, defaults to 8
+    :return np.ndarray: Features `(n, 3 * int_bins)` en float32
+    """
+    int_n, int_height, int_width, int_channels = arr_batch.shape
+    arr_bins = np.clip(arr_batch.astype(np.int64) * int_bins // 256, 0, int_bins - 1)
+    arr_offsets = (np.arange(int_n)[:, None, None, None] * int_channels + np.arange(int_channels)) * int_bins
+    arr_counts = np.bincount(
+        (arr_bins + arr_offsets).ravel(),
+        minlength=int_n * int_channels * int_bins
+    ).reshape(int_n, int_channels * int_bins)
+    return (arr_counts / (int_height * int_width)).astype(np.float32)
+
+
+###############################################################################
+#                                                                             #
+#                              CACHE                                          #
+#                                                                             #
+###############################################################################
+
+
+class FeatureCache:
+    """Cache disque des features d'images : une matrice `.npy` ouverte en
+    memmap (une ligne par image) et un index JSON associant à chaque chemin
+    absolu sa date de modification (ns), sa taille et sa ligne. Une image dont
+    la date ou la taille a changé est recalculée et réécrite sur sa ligne.
+
+    Le cache est propre à un extracteur et à une taille d'image : la
+    `signature` passée à l'ouverture doit être celle enregistrée, sinon une
+    `ValueError` est levée. Un seul processus doit écrire dans un dossier de
+    cache à la fois
+
+    :cvar str str_dir: Dossier du cache
+    :cvar str signature: Description de l'extracteur et du prétraitement
+    """
+
+    def __init__(self, str_dir: str, signature: str):
+        self.str_dir = str_dir
+        self.signature = signature
+        self._arr: np.ndarray | None = None
+        self._dct_entries: dict[str, list[int]] = {}
+        self._int_count = 0
+
+        str_index_path = os.path.join(str_dir, CACHE_INDEX_FILE)
+        if os.path.exists(str_index_path):
+            with open(str_index_path, mode="r", encoding="utf-8") as f:
+                dct_index = json.load(f)
+            if dct_index["signature"] != signature:
+                raise ValueError(
+                    f"Le cache {str_dir} a été créé pour '{dct_index['signature']}', pas pour '{signature}'"
+                )
+            self._dct_entries = dct_index["entries"]
+            self._int_count = dct_index["count"]
+            self._arr = np.load(os.path.join(str_dir, CACHE_FEATURES_FILE), mmap_mode="r+")
+
+    @staticmethod
+    def get_key(str_path: str) -> tuple[str, int, int]:
+        """Clé d'une image : chemin absolu, date de modification (ns) et taille
+
+        :param str str_path: Chemin de l'image
+        :return tuple[str, int, int]: La clé
+        """
+        stat = os.stat(str_path)
+        return os.path.abspath(str_path), stat.st_mtime_ns, stat.st_size
+
+    @property
+    def dim(self) -> int | None:
+        """Nombre de features par image, None tant que le cache est vide"""
+        return None if self._arr is None else self._arr.shape[1]
+
+    def lookup(self, arr_keys: list[tuple[str, int, int]]) -> np.ndarray:
+        """Cherche des images dans le cache
+
+        :param list[tuple[str, int, int]] arr_keys: Clés (cf. `get_key`)
+        :return np.ndarray: Ligne de chaque image dans le cache, -1 si absente ou modifiée
+        """
+        arr_rows = np.full(len(arr_keys), -1, dtype=np.int64)
+        for int_i, (str_path, int_mtime, int_size) in enumerate(arr_keys):
+            entry = self._dct_entries.get(str_path)
+            if entry is not None and entry[0] == int_mtime and entry[1] == int_size:
+                arr_rows[int_i] = entry[2]
+        return arr_rows
+
+    def get(self, arr_rows: np.ndarray) -> np.ndarray:
+        """Lit des lignes du cache
+
+        :param np.ndarray arr_rows: Lignes (cf. `lookup`)
+        :return np.ndarray: Copie des features correspondantes
+        """
+        return np.asarray(self._arr[arr_rows])
+
+    def put(self, arr_keys: list[tuple[str, int, int]], arr_features: np.ndarray) -> None:
+        """Écrit les features d'images dans le cache (sans mettre à jour l'index
+        sur disque, cf. `save`)
+
+        :param list[tuple[str, int, int]] arr_keys: Clés des images (cf. `get_key`)
+        :param np.ndarray arr_features: Features `(len(arr_keys), dim)`
+        """
+        if self._arr is None:
+            os.makedirs(self.str_dir, exist_ok=True)
+            self._arr = np.lib.format.open_memmap(
+                os.path.join(self.str_dir, CACHE_FEATURES_FILE),
+                mode="w+",
+                dtype=np.float32,
+                shape=(max(CACHE_MIN_CAPACITY, len(arr_keys)), arr_features.shape[1])
+            )
+        elif arr_features.shape[1] != self.dim:
+            raise ValueError(f"L'extracteur retourne {arr_features.shape[1]} features, le cache en contient {self.dim}")
+
+        arr_rows = []
+        for str_path, int_mtime, int_size in arr_keys:
+            entry = self._dct_entries.get(str_path)
+            if entry is None:
+                entry = [int_mtime, int_size, self._int_count]
+                self._int_count += 1
+            self._dct_entries[str_path] = [int_mtime, int_size, entry[2]]
+            arr_rows.append(entry[2])
+
+        if self._int_count > self._arr.shape[0]:
+            self._grow(self._int_count)
+        self._arr[np.asarray(arr_rows)] = arr_features
+
+    def _grow(self, int_min_rows: int) -> None:
+        """Agrandit la matrice (capacité doublée) en la recopiant dans un nouveau fichier
+
+        :param int int_min_rows: Nombre minimum de lignes
+        """
+        int_capacity = self._arr.shape[0]
+        while int_capacity < int_min_rows:
+            int_capacity *= 2
+
+        str_path = os.path.join(self.str_dir, CACHE_FEATURES_FILE)
+        str_tmp_path = f"{str_path}.tmp"
+        arr_new = np.lib.format.open_memmap(str_tmp_path, mode="w+", dtype=np.float32, shape=(int_capacity, self.dim))
+        arr_new[:self._arr.shape[0]] = self._arr
+        arr_new.flush()
+        del arr_new
+        self._arr = None
+        os.replace(str_tmp_path, str_path)
+        self._arr = np.load(str_path, mmap_mode="r+")
+
+    def save(self) -> None:
+        """Écrit la matrice sur disque puis l'index (remplacé de façon atomique)"""
+        if self._arr is None:
+            return
+        self._arr.flush()
+
+        str_index_path = os.path.join(self.str_dir, CACHE_INDEX_FILE)
+        with open(f"{str_index_path}.tmp", mode="w", encoding="utf-8") as f:
+            json.dump(
+                {"signature": self.signature, "count": self._int_count, "entries": self._dct_entries},
+                f,
+                ensure_ascii=False
+            )
+        os.replace(f"{str_index_path}.tmp", str_index_path)
+
+
+###############################################################################
+#                                                                             #
+#                              PIPELINE                                       #
+#                                                                             #
+###############################################################################
+
+
+def _get_signature(extractor: Callable, target_size: tuple[int, int], resample: str, draft: bool) -> str:
+    """Signature par défaut d'un cache : nom qualifié de l'extracteur et prétraitement
+
+    :return str: La signature
+    """
+    str_name = getattr(extractor, "__qualname__", type(extractor).__qualname__)
+    return f"{getattr(extractor, '__module__', '')}.{str_name}|{target_size[0]}x{target_size[1]}|{resample}{'|draft' if draft else ''}"
+
+
+def extract_features(
+    images: str | list[str],
+    extractor: Callable[[np.ndarray], np.ndarray],
+    target_size: tuple[int, int] = (224, 224),
+    batch_size: int = 32,
+    max_workers: int = 4,
+    executor: str = "thread",
+    prefetch: int = 2,
+    resample: str = "nearest",
+    draft: bool = False,
+    cache_dir: str | None = None,
+    cache_signature: str | None = None,
+    verbose: bool = False
+) -> np.ndarray:
+    """Calcule les features d'une liste d'images par lots de taille fixe
+
+    Le décodage des lots suivants (jusqu'à `prefetch` lots d'avance) se fait
+    dans le pool pendant que l'extracteur traite le lot courant. Le dernier lot
+    (ou un lot amputé d'images illisibles) est complété par des zéros jusqu'à
+    `batch_size`, pour que l'extracteur reçoive toujours la même forme, et les
+    lignes correspondantes sont ignorées. Les images illisibles ont des
+    features NaN et ne sont pas mises en cache
+
+    :param str | list[str] images: Chemins des images, ou glob passé à `get_files`
+    :param Callable[[np.ndarray], np.ndarray] extractor: Fonction recevant un lot
+        `(batch_size, hauteur, largeur, 3)` en float32 (0..255) et retournant
+        `(batch_size, dim)` features (ex: `model.predict` après `preprocess_input`)
+    :param tuple[int, int], optional target_size: Taille (hauteur, largeur) des
+        images, defaults to (224, 224)
+    :param int, optional batch_size: Nombre d'images par appel à l'extracteur, defaults to 32
+    :param int, optional max_workers: Nombre de threads/processus de décodage, defaults to 4
+    :param str, optional executor: "thread" (PIL libère le GIL pendant le
+        décodage) ou "process" (processus lancés en "spawn" : le script
+        appelant doit être protégé par `if __name__ == "__main__"`), defaults to "thread"
+    :param int, optional prefetch: Nombre de lots décodés à l'avance, defaults to 2
+    :param str, optional resample: Méthode de redimensionnement (cf. `load_image`),
+        defaults to "nearest"
+    :param bool, optional draft: Réduit les JPEG dès le décodage (cf. `load_image`),
+        defaults to False
+    :param str | None, optional cache_dir: Dossier du cache de features (cf.
+        `FeatureCache`), defaults to None (pas de cache)
+    :param str | None, optional cache_signature: Signature du cache, à préciser
+        pour un extracteur anonyme (lambda), defaults to None (nom de l'extracteur,
+        taille, rééchantillonnage et `draft`)
+    :param bool, optional verbose: Affiche la progression, defaults to False
+    :return np.ndarray: Features `(len(images), dim)` en float32, dans l'ordre des images
+    """
+    arr_paths = get_files(images) if isinstance(images, str) else list(images)
+    int_n = len(arr_paths)
+
+    cache = None
+    arr_keys = []
+    arr_rows = np.full(int_n, -1, dtype=np.int64)
+    if cache_dir is not None:
+        cache = FeatureCache(cache_dir, cache_signature or _get_signature(extractor, target_size, resample, draft))
+        arr_keys = [FeatureCache.get_key(str_path) for str_path in arr_paths]
+        arr_rows = cache.lookup(arr_keys)
+
+    arr_todo = np.flatnonzero(arr_rows < 0)
+    if verbose:
+        print(f"INFO - {int_n} image(s), {int_n - len(arr_todo)} en cache, {len(arr_todo)} à traiter")
+
+    arr_features = None
+    if cache is not None and cache.dim is not None:
+        arr_features = np.full((int_n, cache.dim), np.nan, dtype=np.float32)
+        arr_cached = np.flatnonzero(arr_rows >= 0)
+        if len(arr_cached):
+            arr_features[arr_cached] = cache.get(arr_rows[arr_cached])
+
+    arr_batches = [arr_todo[int_start:int_start + batch_size] for int_start in range(0, len(arr_todo), batch_size)]
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        raise ValueError(f"executor doit valoir 'thread' ou 'process', pas '{executor}'")
+
+    try:
+        with pool:
+            queue: deque[list[Future]] = deque()
+            int_next = 0
+            for int_batch, arr_batch_idx in enumerate(arr_batches):
+                while int_next < len(arr_batches) and int_next <= int_batch + prefetch:
+                    queue.append([
+                        pool.submit(_load_image_safe, arr_paths[int_i], target_size, resample, draft)
+                        for int_i in arr_batches[int_next]
+                    ])
+                    int_next += 1
+
+                arr_images = np.zeros((batch_size, target_size[0], target_size[1], 3), dtype=np.float32)
+                arr_ok = []
+                for int_i, future in zip(arr_batch_idx, queue.popleft()):
+                    arr_image, str_error = future.result()
+                    if arr_image is None:
+                        print(f"WARNING - Image illisible {arr_paths[int_i]} : {str_error}")
+                        continue
+                    arr_images[len(arr_ok)] = arr_image
+                    arr_ok.append(int_i)
+
+                if not arr_ok:
+                    continue
+                arr_output = np.asarray(extractor(arr_images), dtype=np.float32).reshape(batch_size, -1)[:len(arr_ok)]
+
+                if arr_features is None:
+                    arr_features = np.full((int_n, arr_output.shape[1]), np.nan, dtype=np.float32)
+                arr_features[arr_ok] = arr_output
+                if cache is not None:
+                    cache.put([arr_keys[int_i] for int_i in arr_ok], arr_output)
+
+                if verbose:
+                    print(f"INFO - Lot {int_batch + 1}/{len(arr_batches)} traité")
+    finally:
+        # Les lots déjà traités restent en cache même si l'extracteur échoue
+        if cache is not None:
+            cache.save()
+
+    if arr_features is None:
+        # Aucune image lisible : dimension inconnue
+        return np.full((int_n, 0), np.nan, dtype=np.float32)
+    return arr_features
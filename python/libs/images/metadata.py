@@ -0,0 +1,282 @@
+"""Profil des métadonnées d'un dossier d'images
+
+Exemple (dataset météo du notebook de transfer learning) :
+
+    df_images = profile_images("weather/dataset_train/*/*.jp*")
+    analyze_dataframe(df_images.drop(columns=["image_path", "phash"]), output_name="images")
+    get_association_table(df_images[["label", "resolution", "mode"]])
+
+Une ligne par image : label, format, mode et nombre de canaux, dimensions,
+ratio, taille du fichier, lisibilité et hash perceptuel. Les dimensions et le
+mode sont lus dans l'en-tête, sans décoder les pixels ; seul le hash
+perceptuel (optionnel) décode l'image, réduite dès le décodage pour les JPEG.
+Les quasi-doublons sont regroupés via un index sur des morceaux du hash
+(cf. `find_near_duplicates`), sans comparer toutes les paires d'images.
+"""
+import os
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from ..utils.file_system import get_files
+from ..utils.converter import bytes_to_mega_bytes
+
+PHASH_IMAGE_SIZE = 32 # Côté de l'image en niveaux de gris sur laquelle est calculée la DCT
+PHASH_SIZE = 8 # Côté du bloc de basses fréquences conservé (hash de 8 x 8 = 64 bits)
+DUPLICATE_MAX_DISTANCE = 4 # Distance de Hamming maximale entre les hashs de deux quasi-doublons
+METADATA_FIELDS = ("image_path", "format", "mode", "channels", "width", "height", "file_size", "error", "phash") # Champs lus par `read_image_metadata`
+
+
+###############################################################################
+#                                                                             #
+#                              LECTURE                                        #
+#                                                                             #
+###############################################################################
+
+
+def _get_dct_matrix(int_size: int) -> np.ndarray:
+    """Matrice de la DCT-II orthonormée
+
+    :param int int_size: Taille du signal
+    :return np.ndarray: Matrice `(int_size, int_size)`
+    """
+    arr_k = np.arange(int_size)[:, None]
+    arr_n = np.arange(int_size)[None, :]
+    arr_dct = np.sqrt(2 / int_size) * np.cos(np.pi * (2 * arr_n + 1) * arr_k / (2 * int_size))
+    arr_dct[0] /= np.sqrt(2)
+    return arr_dct
+
+
+_DCT_MATRIX = _get_dct_matrix(PHASH_IMAGE_SIZE)
+
+
+def get_phash(img) -> int:
+    """Hash perceptuel (pHash) d'une image : DCT de l'image réduite en niveaux
+    de gris, puis un bit par coefficient de basse fréquence selon qu'il est
+    au-dessus de la médiane. Deux images visuellement proches (redimensionnée,
+    recompressée, ...) ont des hashs à faible distance de Hamming
+
+    :param PIL.Image.Image img: Image PIL
+    :return int: Hash sur 64 bits
+    """
+    from PIL import Image
+
+    arr_gray = np.asarray(
+        img.convert("L").resize((PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), Image.Resampling.LANCZOS),
+        dtype=np.float64
+    )
+    arr_low = (_DCT_MATRIX @ arr_gray @ _DCT_MATRIX.T)[:PHASH_SIZE, :PHASH_SIZE].ravel()
+    arr_bits = arr_low > np.median(arr_low[1:]) # Le coefficient continu (moyenne) est exclu de la médiane
+    return int.from_bytes(np.packbits(arr_bits).tobytes(), "big")
+
+
+def read_image_metadata(str_path: str, compute_hash: bool = True) -> dict:
+    """Lit les métadonnées d'une image. Le format, le mode et les dimensions
+    viennent de l'en-tête ; les pixels ne sont décodés que pour le hash
+
+    :param str str_path: Chemin de l'image
+    :param bool, optional compute_hash: Calcule le hash perceptuel (et vérifie
+        ainsi que l'image se décode entièrement), defaults to True
+    :return dict: Métadonnées (cf. `profile_images`), avec `error` renseigné
+        si l'image est illisible
+    """
+    from PIL import Image
+
+    dct_meta = dict.fromkeys(METADATA_FIELDS)
+    dct_meta["image_path"] = str_path
+    try:
+        dct_meta["file_size"] = os.stat(str_path).st_size
+        with Image.open(str_path) as img:
+            dct_meta["format"] = img.format
+            dct_meta["mode"] = img.mode
+            dct_meta["channels"] = len(img.getbands())
+            dct_meta["width"], dct_meta["height"] = img.size
+            if compute_hash:
+                img.draft("L", (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE))
+                dct_meta["phash"] = get_phash(img)
+    except Exception as e:
+        dct_meta["error"] = f"{type(e).__name__}: {e}"
+    return dct_meta
+
+
+###############################################################################
+#                                                                             #
+#                              QUASI-DOUBLONS                                 #
+#                                                                             #
+###############################################################################
+
+
+def _hamming(arr_a: np.ndarray, arr_b: np.ndarray) -> np.ndarray:
+    """Distance de Hamming entre des hashs de 64 bits, deux à deux
+
+    :param np.ndarray arr_a: Hashs (uint64)
+    :param np.ndarray arr_b: Hashs (uint64), même taille que `arr_a`
+    :return np.ndarray: Nombre de bits différents
+    """
+    arr_xor = np.bitwise_xor(arr_a, arr_b).astype(">u8")
+    return np.unpackbits(arr_xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def find_near_duplicates(arr_hashes: np.ndarray, int_max_distance: int = DUPLICATE_MAX_DISTANCE) -> np.ndarray:
+    """Regroupe les hashs perceptuels à distance de Hamming au plus
+    `int_max_distance` (de proche en proche).
+
+    Le hash est découpé en `int_max_distance + 1` morceaux : deux hashs assez
+    proches ont au moins un morceau identique (principe des tiroirs). Seules
+    les paires partageant un morceau sont comparées, au lieu de toutes les
+    paires. Les hashs identiques sont dédoublonnés avant la recherche
+
+    :param np.ndarray arr_hashes: Hashs de 64 bits (uint64)
+    :param int, optional int_max_distance: Distance de Hamming maximale,
+        defaults to DUPLICATE_MAX_DISTANCE
+    :return np.ndarray: Numéro de groupe de chaque hash (0, 1, ... dans
+        l'ordre de première apparition), -1 s'il n'a pas de quasi-doublon
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    arr_hashes = np.asarray(arr_hashes, dtype=np.uint64)
+    if len(arr_hashes) == 0:
+        return np.empty(0, dtype=np.int64)
+    arr_unique, arr_inverse = np.unique(arr_hashes, return_inverse=True)
+    int_unique = len(arr_unique)
+
+    arr_left, arr_right = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    arr_bounds = np.linspace(0, 64, min(int_max_distance, 63) + 2).astype(int)
+    for int_start, int_end in zip(arr_bounds[:-1], arr_bounds[1:]):
+        arr_keys = (arr_unique >> np.uint64(int_start)) & np.uint64((1 << int(int_end - int_start)) - 1)
+        arr_order = np.argsort(arr_keys, kind="stable")
+        arr_sorted = arr_keys[arr_order]
+        arr_starts = np.flatnonzero(np.r_[True, arr_sorted[1:] != arr_sorted[:-1]])
+        arr_sizes = np.diff(np.r_[arr_starts, int_unique])
+        for int_bucket_start, int_size in zip(arr_starts[arr_sizes > 1], arr_sizes[arr_sizes > 1]):
+            arr_members = arr_order[int_bucket_start:int_bucket_start + int_size]
+            arr_i, arr_j = np.triu_indices(int_size, 1)
+            arr_left.append(arr_members[arr_i])
+            arr_right.append(arr_members[arr_j])
+
+    arr_left, arr_right = np.concatenate(arr_left), np.concatenate(arr_right)
+    arr_close = _hamming(arr_unique[arr_left], arr_unique[arr_right]) <= int_max_distance
+    graph = coo_matrix(
+        (np.ones(int(arr_close.sum()), dtype=np.int8), (arr_left[arr_close], arr_right[arr_close])),
+        shape=(int_unique, int_unique)
+    )
+    _, arr_components = connected_components(graph, directed=False)
+
+    # Composantes des hashs d'origine ; un groupe contient au moins deux hashs (identiques ou proches)
+    arr_components = arr_components[arr_inverse]
+    arr_counts = np.bincount(arr_components, minlength=int_unique)
+    arr_in_group = arr_counts[arr_components] > 1
+
+    arr_groups = np.full(len(arr_hashes), -1, dtype=np.int64)
+    _, arr_first, arr_group_ids = np.unique(arr_components[arr_in_group], return_index=True, return_inverse=True)
+    arr_rank = np.empty(len(arr_first), dtype=np.int64)
+    arr_rank[np.argsort(arr_first, kind="stable")] = np.arange(len(arr_first))
+    arr_groups[arr_in_group] = arr_rank[arr_group_ids]
+    return arr_groups
+
+
+###############################################################################
+#                                                                             #
+#                              PROFIL                                         #
+#                                                                             #
+###############################################################################
+
+
+def profile_images(
+    images: str | list[str],
+    label: str | Callable[[str], str] | None = "parent",
+    compute_hash: bool = True,
+    max_distance: int = DUPLICATE_MAX_DISTANCE,
+    max_workers: int = 4,
+    executor: str = "thread",
+    verbose: bool = False
+) -> pd.DataFrame:
+    """Profil des métadonnées d'une liste d'images, lues en parallèle.
+    Le dataframe retourné peut être passé tel quel à `analyze_dataframe` et
+    `get_association_table` (ex: label x résolution)
+
+    Colonnes : `image_path`, `label`, `format`, `mode`, `channels`, `width`,
+    `height`, `aspect_ratio` (largeur / hauteur), `resolution` ("LxH",
+    catégorielle), `file_size_mb`, `is_corrupt`, `error`, et avec
+    `compute_hash` : `phash` (hexadécimal), `duplicate_group` (numéro du
+    groupe de quasi-doublons, NA si aucun) et `is_duplicate` (vrai pour toutes
+    les images d'un groupe sauf la première)
+
+    :param str | list[str] images: Chemins des images, ou glob passé à `get_files`
+    :param str | Callable[[str], str] | None, optional label: "parent" (nom du
+        dossier de l'image), fonction chemin -> label, ou None (pas de colonne
+        `label`), defaults to "parent"
+    :param bool, optional compute_hash: Décode les images pour calculer leur
+        hash perceptuel et chercher les quasi-doublons ; sinon seuls les
+        en-têtes sont lus, defaults to True
+    :param int, optional max_distance: Distance de Hamming maximale entre deux
+        quasi-doublons (cf. `find_near_duplicates`), defaults to DUPLICATE_MAX_DISTANCE
+    :param int, optional max_workers: Nombre de threads/processus de lecture, defaults to 4
+    :param str, optional executor: "thread" ou "process" (processus lancés en
+        "spawn" : le script appelant doit être protégé par
+        `if __name__ == "__main__"`), defaults to "thread"
+    :param bool, optional verbose: Affiche un résumé, defaults to False
+    :return pd.DataFrame: Une ligne par image, dans l'ordre des images
+    """
+    arr_paths = get_files(images) if isinstance(images, str) else list(images)
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        raise ValueError(f"executor doit valoir 'thread' ou 'process', pas '{executor}'")
+
+    with pool:
+        arr_meta = list(pool.map(
+            read_image_metadata,
+            arr_paths,
+            [compute_hash] * len(arr_paths),
+            chunksize=max(1, len(arr_paths) // (max_workers * 4))
+        ))
+
+    # Les hashs (64 bits) sont retirés avant la construction du dataframe, qui les convertirait en float
+    arr_phash = [dct_meta.pop("phash") for dct_meta in arr_meta]
+    df = pd.DataFrame(arr_meta, columns=[str_field for str_field in METADATA_FIELDS if str_field != "phash"])
+    if label == "parent":
+        df.insert(1, "label", [os.path.basename(os.path.dirname(str_path)) for str_path in arr_paths])
+    elif label is not None:
+        df.insert(1, "label", [label(str_path) for str_path in arr_paths])
+
+    for str_col in ("channels", "width", "height"):
+        df[str_col] = df[str_col].astype("Int64")
+    df.insert(df.columns.get_loc("height") + 1, "aspect_ratio", (df["width"] / df["height"]).astype("Float64"))
+    df.insert(
+        df.columns.get_loc("aspect_ratio") + 1,
+        "resolution",
+        (df["width"].astype("string") + "x" + df["height"].astype("string")).astype("category")
+    )
+    df.insert(df.columns.get_loc("file_size"), "file_size_mb", bytes_to_mega_bytes(df["file_size"].astype("Float64")))
+    df.insert(df.columns.get_loc("error"), "is_corrupt", df["error"].notna())
+    df = df.drop(columns="file_size")
+
+    if compute_hash:
+        arr_hashed = np.array([int_hash is not None for int_hash in arr_phash], dtype=bool)
+        arr_hashes = np.array([int_hash for int_hash in arr_phash if int_hash is not None], dtype=np.uint64)
+        arr_groups = np.full(len(df), -1, dtype=np.int64)
+        arr_groups[arr_hashed] = find_near_duplicates(arr_hashes, max_distance)
+        ser_groups = pd.Series(arr_groups, index=df.index, dtype="Int64").mask(arr_groups == -1)
+
+        df["phash"] = pd.Series([None if int_hash is None else f"{int_hash:016x}" for int_hash in arr_phash], index=df.index, dtype="string")
+        df["duplicate_group"] = ser_groups
+        df["is_duplicate"] = ser_groups.notna() & ser_groups.duplicated()
+
+    if verbose:
+        str_summary = f"INFO - {len(df)} image(s), {int(df['is_corrupt'].sum())} illisible(s)"
+        if compute_hash:
+            str_summary += (
+                f", {df['duplicate_group'].nunique()} groupe(s) de quasi-doublons"
+                f" ({int(df['is_duplicate'].sum())} image(s) en trop)"
+            )
+        print(str_summary)
+
+    return df
@@ -1,4 +1,37 @@
-from .converter import *
-from .analysis import *
-from .file_system import *
-from .frame import *
\ No newline at end of file
+"""Utilitaires. Les sous-modules (et leurs dépendances lourdes : pandas, plotly,
+scipy, joblib) ne sont importés qu'au premier accès à l'un de leurs noms"""
+import importlib
+
+_SUBMODULES = ("converter", "analysis", "file_system", "frame")
+
+_EXPORTS = {
+    "bool_to_text": "converter",
+    "bytes_to_giga_bytes": "converter",
+    "bytes_to_mega_bytes": "converter",
+    "str_to_datetime64": "converter",
+    "MAX_CONTINGENCY_CELLS": "analysis",
+    "draw_correlation_heatmap": "analysis",
+    "get_association_table": "analysis",
+    "check_col_format": "analysis",
+    "get_files": "file_system",
+    "transform_column_names": "frame",
+    "apply_to_col": "frame",
+    "expand_dict": "frame",
+    "expand_class_instance": "frame",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__ + list(_SUBMODULES))
@@ -1,27 +1,166 @@
 import pandas as pd
 import numpy as np
-import plotly.express as px
 from itertools import combinations
-import joblib
-from scipy.stats.contingency import association
 import time
-from typing import List, Tuple
+from typing import List, Tuple, TYPE_CHECKING
 import gc
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 MAX_CONTINGENCY_CELLS = int(20_000_000) # Taille maximale acceptée pour la table de contingence
+SPARSE_MARKER_PARAMS = {"zmin": "cmin", "zmax": "cmax", "color_continuous_midpoint": "cmid", "color_continuous_scale": "colorscale"} # Paramètres `px.imshow` repris par les marqueurs de la vue creuse
+SPARSE_LAYOUT_PARAMS = ("width", "height", "template") # Paramètres `px.imshow` repris par la mise en page de la vue creuse
+
+
+
+def _cluster_order(corr_matrix: pd.DataFrame) -> np.ndarray:
+    """Calcule un ordre des colonnes regroupant les variables fortement corrélées,
+    par classification hiérarchique (lien moyen) sur la distance `1 - |r|`.
+
+    :param pd.DataFrame corr_matrix: Matrice de corrélation carrée.
+
+    :return np.ndarray: Positions des colonnes dans l'ordre des feuilles du dendrogramme.
+    """
+    n = corr_matrix.shape[0]
+    if n < 3:
+        return np.arange(n)
+
+    dist = 1.0 - np.abs(corr_matrix.to_numpy(dtype=float, copy=True))
+    dist = np.nan_to_num(dist, nan=1.0)
+    dist = np.clip((dist + dist.T) / 2, 0.0, 1.0)
+    np.fill_diagonal(dist, 0.0)
+
+    from scipy.cluster.hierarchy import linkage, leaves_list
+    from scipy.spatial.distance import squareform
+
+    return leaves_list(linkage(squareform(dist, checks=False), method="average"))
+
 
+def _tile_matrix(values: np.ndarray, labels: List[str], tile_size: int) -> Tuple[np.ndarray, List[str]]:
+    """Agrège une matrice carrée en tuiles de `tile_size x tile_size` cellules (moyenne
+    en ignorant les NaN).
 
+    :param np.ndarray values: Matrice carrée à agréger.
+    :param List[str] labels: Libellés des lignes/colonnes.
+    :param int tile_size: Nombre de lignes/colonnes par tuile.
 
-def draw_correlation_heatmap(corr_matrix:pd.DataFrame, title:str=None, mask_top:bool=True, **plot_params):
+    :return Tuple[np.ndarray, List[str]]: La matrice agrégée et les libellés des tuiles
+        (`"première … dernière"` colonne de chaque tuile).
+    """
+    n = values.shape[0]
+    n_tiles = -(-n // tile_size)
+    padded = np.full((n_tiles * tile_size, n_tiles * tile_size), np.nan)
+    padded[:n, :n] = values
+
+    blocks = padded.reshape(n_tiles, tile_size, n_tiles, tile_size)
+    counts = np.sum(~np.isnan(blocks), axis=(1, 3))
+    sums = np.nansum(blocks, axis=(1, 3))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tiles = np.where(counts > 0, sums / counts, np.nan)
+
+    tile_labels = [
+        f"{labels[i]} … {labels[min(i + tile_size, n) - 1]}" if min(i + tile_size, n) - 1 > i else labels[i]
+        for i in range(0, n, tile_size)
+    ]
+    return tiles, tile_labels
+
+
+def draw_correlation_heatmap(
+    corr_matrix: pd.DataFrame,
+    title: str = None,
+    mask_top: bool = True,
+    cluster: bool = None,
+    max_size: int = 500,
+    top_k: int = None,
+    output_path: str = None,
+    show: bool = False,
+    **plot_params
+) -> "go.Figure":
     '''Affiche une heatmap correspondant à une matrice de corrélation donnée.
 
+    Pour les grandes matrices, les colonnes sont réordonnées par classification
+    hiérarchique afin de faire apparaître les blocs de variables corrélées, et la
+    matrice est agrégée en tuiles (moyenne) si elle dépasse `max_size` lignes/colonnes.
+
     :param pd.DataFrame corr_matrix: Matrice de corrélation visualiser.
+    :param str title: Titre du graphique.
+    :param bool mask_top: Masque le triangle supérieur (diagonale incluse).
+    :param bool cluster: Réordonne les colonnes par classification hiérarchique.
+        Par défaut (None), uniquement si la matrice dépasse `max_size`.
+    :param int max_size: Nombre maximal de lignes/colonnes affichées. Au-delà, les
+        cellules sont agrégées en tuiles.
+    :param int top_k: Si renseigné, n'affiche que les `top_k` paires ayant la plus
+        forte corrélation en valeur absolue, sous forme de nuage de points.
+    :param str output_path: Si renseigné, la figure est écrite dans ce fichier
+        (`.html` ou image supportée par Plotly).
+    :param bool show: Affiche la figure (`fig.show()`). Désactivé par défaut :
+        la figure est retournée (et affichée une seule fois par Jupyter en fin
+        de cellule) ; les versions précédentes l'affichaient et retournaient None.
+    :param plot_params: Paramètres passés à `px.imshow`. Avec `top_k`, seuls
+        `zmin`/`zmax`, `color_continuous_midpoint`, `color_continuous_scale`,
+        `width`, `height` et `template` sont repris ; les autres sont ignorés.
+
+    :return go.Figure: La figure générée.
     '''
-    if mask_top:
-        mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-        corr_matrix = corr_matrix.mask(mask)
-    fig = px.imshow(corr_matrix, title=title, **plot_params)
-    fig.show()
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    n = corr_matrix.shape[0]
+    if cluster is None:
+        cluster = n > max_size
+
+    if cluster:
+        order = _cluster_order(corr_matrix)
+        corr_matrix = corr_matrix.iloc[order, order]
+
+    labels = [str(c) for c in corr_matrix.columns]
+    values = corr_matrix.to_numpy(dtype=float, copy=True)
+
+    if top_k is not None:
+        # Vue creuse : uniquement les paires les plus fortement corrélées du triangle inférieur
+        rows, cols = np.tril_indices(n, -1)
+        strength = np.nan_to_num(np.abs(values[rows, cols]), nan=-1.0)
+        k = min(top_k, strength.shape[0])
+        best = np.argpartition(-strength, k - 1)[:k] if k > 0 else np.array([], dtype=int)
+        best = best[strength[best] >= 0]
+        rows, cols = rows[best], cols[best]
+
+        marker_params = dict(colorscale="RdBu_r", cmin=-1, cmax=1)
+        marker_params.update({
+            marker_key: plot_params[imshow_key]
+            for imshow_key, marker_key in SPARSE_MARKER_PARAMS.items() if imshow_key in plot_params
+        })
+        fig = go.Figure(go.Scattergl(
+            x=[labels[c] for c in cols],
+            y=[labels[r] for r in rows],
+            mode="markers",
+            marker=dict(color=values[rows, cols], colorbar=dict(title="r"), **marker_params),
+            hovertemplate="%{x} - %{y}: %{marker.color:.3f}<extra></extra>"
+        ))
+        fig.update_layout(
+            title=title,
+            xaxis=dict(categoryorder="array", categoryarray=labels, showticklabels=n <= max_size),
+            yaxis=dict(categoryorder="array", categoryarray=labels, showticklabels=n <= max_size, autorange="reversed"),
+            **{key: plot_params[key] for key in SPARSE_LAYOUT_PARAMS if key in plot_params}
+        )
+    else:
+        if mask_top:
+            values[np.triu_indices(n)] = np.nan
+
+        if n > max_size:
+            values, labels = _tile_matrix(values, labels, -(-n // max_size))
+
+        fig = px.imshow(values, x=labels, y=labels, title=title, **plot_params)
+
+    if output_path is not None:
+        if output_path.lower().endswith(".html"):
+            fig.write_html(output_path, include_plotlyjs="cdn")
+        else:
+            fig.write_image(output_path)
+    if show:
+        fig.show()
+    return fig
 
 ################################################################################
 #                                                                              #
@@ -41,6 +180,8 @@ def _assoc_from_codes_safe(codes_a, codes_b, col_a=None, col_b=None, verbose=Fal
     :return float: L'association entre les deux colonnes, ou NaN si l'association n'est pas
                possible (taille de table de contingence trop petite, valeurs manquantes, etc.).
     """
+    from scipy.stats.contingency import association
+
     try:
         # Masquer les NaN (-1)
         mask = (codes_a != -1) & (codes_b != -1)
@@ -171,6 +312,8 @@ def get_association_table(
     chunks = _chunk_pairs(pairs, batch_size)
     total_pairs = len(pairs)
     processed_pairs = 0
+    import joblib
+
     n_jobs = max(1, min(max_workers, joblib.cpu_count()))
 
     for idx, chunk in enumerate(chunks, 1):
@@ -199,7 +342,8 @@ def get_association_table(
         gc.collect()
 
     # Diagonale (1.0 pour association parfaite avec soi-même)
-    np.fill_diagonal(association_table.values, 1.0)
+    for c in valid_cols:
+        association_table.loc[c, c] = 1.0
 
     total_time = time.perf_counter() - start_all
     if verbose:
@@ -1,16 +1,68 @@
-import pandas as pd
-import numpy as np
+from typing import TYPE_CHECKING
 
-def bool_to_text(val: any) -> str | None:
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+BOOL_TEXT_CATEGORIES = ["Non", "Oui"] # Modalités (dans l'ordre False, True) retournées par `bool_to_text`
+
+
+def _is_array(val: any) -> bool:
+    """Indique si une valeur est un tableau (Series, Index, ndarray, ...) et non
+    un scalaire. Les scalaires NumPy (`ndim == 0`) sont traités comme des scalaires
+
+    :param any val: Valeur à tester
+    :return bool: `True` si la valeur a au moins une dimension
+    """
+    return getattr(val, "ndim", 0) > 0
+
+
+def _wrap_like(val: any, values: any) -> any:
+    """Remet des valeurs calculées dans la forme de l'entrée : une Series garde
+    son index et son nom, un Index garde son nom
+
+    :param any val: Entrée d'origine (Series, Index ou ndarray)
+    :param any values: Valeurs calculées, à plat
+    :return any: Les valeurs sous la forme de l'entrée
+    """
+    import pandas as pd
+
+    if isinstance(val, pd.Series):
+        return pd.Series(values, index=val.index, name=val.name)
+    if isinstance(val, pd.Index):
+        return pd.Index(values, name=val.name)
+    return values
+
+
+def bool_to_text(val: any) -> "str | None | pd.Series | pd.Categorical":
     """Transforme une valeur boolish en texte (`"Oui"`/`"Non"`/`None`)
 
-    :param any val: Une valeur boolish, c'est-à-dire pouvant être interprétée comme un bool
-    
-    :return str | None: Retourne `None` si la valeur passée est None
+    Une Series, un Index ou un ndarray est converti en une seule passe en
+    catégoriel (`"Non"`, `"Oui"`), les valeurs manquantes (None, NaN, NA,
+    NaT) restant manquantes
+
+    :param any val: Une valeur boolish, c'est-à-dire pouvant être interprétée comme un bool,
+        ou un tableau de telles valeurs
+
+    :return str | None | pd.Series | pd.Categorical: Retourne `None` si la valeur passée est None
         sinon si la valeur est trueish alors `"Oui"`
-        sinon `"Non"`
+        sinon `"Non"`.
+        Pour une Series (resp. un Index), une Series (resp. un Index) catégorielle
+        de même index, pour un ndarray un `pd.Categorical` (à plat)
 
     """
+    if _is_array(val):
+        import numpy as np
+        import pandas as pd
+
+        arr = val.to_numpy() if isinstance(val, (pd.Series, pd.Index)) else np.asarray(val).ravel()
+        arr_mask = np.asarray(pd.isna(arr), dtype=bool)
+        arr_bool = np.zeros(arr.shape[0], dtype=bool)
+        arr_bool[~arr_mask] = arr[~arr_mask].astype(bool)
+
+        arr_codes = np.where(arr_mask, -1, arr_bool.astype(np.int8))
+        return _wrap_like(val, pd.Categorical.from_codes(arr_codes, categories=BOOL_TEXT_CATEGORIES))
+
     if val is None:
         return None
     elif val:
@@ -19,40 +71,98 @@ def bool_to_text(val: any) -> str | None:
         return "Non"
 
 
-def bytes_to_giga_bytes(val: None | int | float) -> float | None:
+def _divide(val: any, int_divisor: int) -> any:
+    """Divise un tableau de valeurs numériques en une seule opération. Les
+    tableaux d'objets (ex: avec des `None`) sont d'abord convertis en nombres,
+    les valeurs manquantes devenant NaN
+
+    :param any val: Series, Index ou ndarray
+    :param int int_divisor: Diviseur
+    :return any: Le tableau divisé, de même forme que l'entrée
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(val, (pd.Series, pd.Index)):
+        if val.dtype == object:
+            val = pd.to_numeric(val)
+        return val / int_divisor
+
+    arr = np.asarray(val)
+    if arr.dtype == object:
+        arr = pd.to_numeric(arr.ravel()).reshape(arr.shape)
+    return arr / int_divisor
+
+
+def bytes_to_giga_bytes(val: "None | int | float | pd.Series | np.ndarray") -> "float | None | pd.Series | np.ndarray":
     """Convertit un bomre de bytes (octets) en GigaBytes (Giga-octets)
     en divisant par 1 milliard (`1000 * 1000 * 1000`)
 
-    :param None | int | float val: Une valeur numérique ou `None`
+    :param None | int | float | pd.Series | np.ndarray val: Une valeur numérique ou `None`,
+        ou un tableau de valeurs numériques
 
-    :return float | None: Retourne `None` si la valeur passée est `None`
-        sinon retourne la valeur divisée par 1 milliard
+    :return float | None | pd.Series | np.ndarray: Retourne `None` si la valeur passée est `None`
+        sinon retourne la valeur divisée par 1 milliard.
+        Un tableau est divisé en une seule opération, ses valeurs manquantes restant manquantes
     """
+    if _is_array(val):
+        return _divide(val, 1000 * 1000 * 1000)
     if val is None:
         return None
     else:
         return val / (1000 * 1000 * 1000)
 
 
-def bytes_to_mega_bytes(val: None | int | float) -> float | None:
+def bytes_to_mega_bytes(val: "None | int | float | pd.Series | np.ndarray") -> "float | None | pd.Series | np.ndarray":
     """Convertit un bomre de bytes (octets) en MegaBytes (Mega-octets)
     en divisant par 1 million (`1000 * 1000`)
 
-    :param None | int | float val: Une valeur numérique ou `None`
-    
-    :return float | None: Retourne `None` si la valeur passée est None
-        sinon retourne la valeur divisée par 1 million
+    :param None | int | float | pd.Series | np.ndarray val: Une valeur numérique ou `None`,
+        ou un tableau de valeurs numériques
+
+    :return float | None | pd.Series | np.ndarray: Retourne `None` si la valeur passée est None
+        sinon retourne la valeur divisée par 1 million.
+        Un tableau est divisé en une seule opération, ses valeurs manquantes restant manquantes
     """
+    if _is_array(val):
+        return _divide(val, 1000 * 1000)
     if val is None:
         return None
     else:
         return val / (1000 * 1000)
 
 
-def str_to_datetime64(str_input: str) -> np.datetime64:
+def str_to_datetime64(
+    str_input: "str | pd.Series | np.ndarray",
+    format: str | None = None,
+    cache: bool = True
+) -> "np.datetime64 | pd.Series | np.ndarray":
     """Convertit un string en datetime
 
-    :param str str_input: Datetime sous la forme d'un string
-    :return np.datetime64: Le string sous forme de datetime
+    Une Series, un Index ou un ndarray est converti en un seul appel à
+    `pd.to_datetime`. Avec `cache`, chaque valeur distincte n'est analysée
+    qu'une fois (utile pour les colonnes de dates très répétées) ; `format`
+    évite l'inférence du format
+
+    :param str | pd.Series | np.ndarray str_input: Datetime sous la forme d'un string,
+        ou tableau de strings
+    :param str | None, optional format: Format `strftime` des dates (ex: "%d/%m/%Y"),
+        defaults to None (format inféré)
+    :param bool, optional cache: Analyse une seule fois chaque valeur distincte
+        d'un tableau, defaults to True
+    :return np.datetime64 | pd.Series | np.ndarray: Le string sous forme de datetime.
+        Pour une Series (resp. un Index), une Series (resp. un Index) `datetime64`
+        de même index, pour un ndarray un ndarray `datetime64` de même forme.
+        Les valeurs manquantes deviennent `NaT`
     """
-    return pd.Timestamp(str_input).to_datetime64()
\ No newline at end of file
+    import pandas as pd
+
+    if _is_array(str_input):
+        if isinstance(str_input, (pd.Series, pd.Index)):
+            return pd.to_datetime(str_input, format=format, cache=cache)
+        arr = pd.to_datetime(str_input.ravel(), format=format, cache=cache).to_numpy()
+        return arr.reshape(str_input.shape)
+
+    if format is not None:
+        return pd.to_datetime(str_input, format=format).to_datetime64()
+    return pd.Timestamp(str_input).to_datetime64()
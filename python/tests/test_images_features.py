@@ -0,0 +1,120 @@
+"""Tests hors ligne de `libs.images.features`, avec `color_histogram_extractor`
+comme modèle de substitution (aucun poids à télécharger)
+
+Lancement (depuis le dossier `python`) :
+
+    python -m pytest tests
+"""
+import os
+import numpy as np
+import pytest
+from PIL import Image
+
+from libs.images.features import (
+    FeatureCache, color_histogram_extractor, extract_features, load_image, _get_signature
+)
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """Dossier de 7 JPEG aléatoires de tailles variées et d'un fichier corrompu"""
+    rng = np.random.default_rng(0)
+    for int_i in range(7):
+        arr = (rng.random((60 + int_i, 80, 3)) * 255).astype(np.uint8)
+        Image.fromarray(arr).save(tmp_path / f"img{int_i}.jpg", quality=90)
+    (tmp_path / "bad.jpg").write_bytes(b"pas une image")
+    return tmp_path
+
+
+def _count_calls(arr_calls: list):
+    def extractor(arr_batch):
+        arr_calls.append(arr_batch.shape)
+        return color_histogram_extractor(arr_batch)
+    return extractor
+
+
+def test_color_histogram_extractor():
+    arr_batch = np.zeros((2, 4, 4, 3), dtype=np.float32)
+    arr_batch[1] = 255
+    arr_features = color_histogram_extractor(arr_batch, int_bins=4)
+
+    assert arr_features.shape == (2, 12)
+    assert arr_features.dtype == np.float32
+    np.testing.assert_allclose(arr_features.reshape(2, 3, 4).sum(axis=2), 1)
+    assert arr_features[0, 0] == 1 and arr_features[1, 3] == 1
+
+
+def test_load_image_matches_plain_pil(image_dir):
+    str_path = str(image_dir / "img0.jpg")
+    with Image.open(str_path) as img:
+        arr_expected = np.asarray(img.convert("RGB").resize((32, 48), Image.Resampling.NEAREST))
+
+    np.testing.assert_array_equal(load_image(str_path, (48, 32)), arr_expected)
+    assert load_image(str_path, (48, 32), draft=True).shape == (48, 32, 3)
+
+
+def test_extract_features_batches_and_errors(image_dir):
+    arr_paths = sorted(str(p) for p in image_dir.iterdir())
+    arr_calls = []
+    arr_features = extract_features(arr_paths, _count_calls(arr_calls), target_size=(16, 16), batch_size=3, max_workers=2)
+
+    assert arr_features.shape == (8, 24)
+    assert set(arr_calls) == {(3, 16, 16, 3)} # Lots de taille fixe, dernier lot complété
+    bool_bad = np.array([os.path.basename(p) == "bad.jpg" for p in arr_paths])
+    assert np.isnan(arr_features[bool_bad]).all()
+    assert not np.isnan(arr_features[~bool_bad]).any()
+
+    arr_single = color_histogram_extractor(load_image(arr_paths[1], (16, 16))[None].astype(np.float32))
+    np.testing.assert_allclose(arr_features[1], arr_single[0])
+
+
+def test_extract_features_cache(image_dir, tmp_path_factory):
+    str_cache = str(tmp_path_factory.mktemp("cache"))
+    str_glob = str(image_dir / "*.jpg")
+    arr_calls = []
+    extractor = _count_calls(arr_calls)
+
+    arr_first = extract_features(str_glob, extractor, target_size=(16, 16), batch_size=4, cache_dir=str_cache, cache_signature="hist")
+    arr_calls.clear()
+    arr_second = extract_features(str_glob, extractor, target_size=(16, 16), batch_size=4, cache_dir=str_cache, cache_signature="hist")
+    assert arr_calls == [] # Seule l'image corrompue est retentée, sans appel à l'extracteur
+    np.testing.assert_array_equal(arr_first, arr_second)
+
+    # Image modifiée : seule celle-ci est recalculée
+    os.utime(image_dir / "img2.jpg", ns=(1, 1))
+    extract_features(str_glob, extractor, target_size=(16, 16), batch_size=4, cache_dir=str_cache, cache_signature="hist")
+    assert len(arr_calls) == 1
+
+    with pytest.raises(ValueError):
+        extract_features(str_glob, extractor, target_size=(16, 16), cache_dir=str_cache, cache_signature="autre")
+
+
+def test_extract_features_keeps_cache_on_failure(image_dir, tmp_path_factory):
+    str_cache = str(tmp_path_factory.mktemp("cache"))
+    arr_paths = sorted(str(p) for p in image_dir.glob("img*.jpg"))
+
+    def failing_extractor(arr_batch):
+        if failing_extractor.int_calls == 1:
+            raise RuntimeError("échec du modèle")
+        failing_extractor.int_calls += 1
+        return color_histogram_extractor(arr_batch)
+    failing_extractor.int_calls = 0
+
+    with pytest.raises(RuntimeError):
+        extract_features(arr_paths, failing_extractor, target_size=(16, 16), batch_size=3, cache_dir=str_cache, cache_signature="hist")
+
+    cache = FeatureCache(str_cache, "hist")
+    arr_rows = cache.lookup([FeatureCache.get_key(p) for p in arr_paths])
+    assert (arr_rows[:3] >= 0).all() and (arr_rows[3:] < 0).all()
+
+
+def test_cache_grows(image_dir, tmp_path_factory, monkeypatch):
+    import libs.images.features as features
+
+    monkeypatch.setattr(features, "CACHE_MIN_CAPACITY", 2)
+    str_cache = str(tmp_path_factory.mktemp("cache"))
+    arr_paths = sorted(str(p) for p in image_dir.glob("img*.jpg"))
+
+    arr_features = extract_features(arr_paths, color_histogram_extractor, target_size=(16, 16), batch_size=2, cache_dir=str_cache)
+    cache = FeatureCache(str_cache, _get_signature(color_histogram_extractor, (16, 16), "nearest", False))
+    np.testing.assert_array_equal(cache.get(cache.lookup([FeatureCache.get_key(p) for p in arr_paths])), arr_features)